@@ -1,9 +1,22 @@
-from flask import Flask
+import hmac
+import os
+import random
+import signal
+import sys
+import threading
+
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
 
+from config import Config
+from utils.admission import AdmissionController
+from utils.deadline import Deadline
+from utils.profiling import RequestProfiler
+
 from routes.jd_summarize_route import jd_summarize_route
 from routes.analyzing_route import analyzing_candidate_route
 from routes.resume_parsing_route import parse_resume_route
+from routes.ranking_route import rank_candidates_route
 
 # Initialize Flask app and database
 app = Flask(__name__)
@@ -25,8 +38,105 @@ analyzing_candidate_route(app)
 ## Route for parsing resumes
 parse_resume_route(app)
 
+## Route for ranking a job's candidates
+rank_candidates_route(app)
+
+# Every request carries a deadline, lowered by the caller's X-Request-Timeout if given
+@app.before_request
+def start_deadline():
+    budget = Config.REQUEST_DEADLINE_SECONDS
+    timeout = request.headers.get("X-Request-Timeout", type=float)
+    if timeout is not None:
+        budget = min(budget, timeout)
+    g.deadline = Deadline(budget, min_stage_seconds=Config.DEADLINE_MIN_STAGE_SECONDS)
+
+# Admission control in front of the LLM routes
+ADMITTED_ENDPOINTS = {"jd_summarize", "shortlisting_candidate", "parse_route"}
+admission = AdmissionController(
+    max_in_flight=Config.ADMISSION_MAX_IN_FLIGHT,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+)
+
+@app.before_request
+def admit_request():
+    if request.endpoint not in ADMITTED_ENDPOINTS or request.method == "OPTIONS":
+        return None
+
+    # Time spent queueing counts against the request deadline
+    if not admission.acquire(g.deadline.remaining()):
+        response = jsonify({"error": "Server is busy, please retry later."})
+        response.headers["Retry-After"] = str(Config.ADMISSION_RETRY_AFTER)
+        return response, 503
+
+    g.admitted = True
+    # Coalesced duplicates only wait on the leader, so the routes hand their slot back early
+    g.release_admission = release_admission_slot
+    return None
+
+def release_admission_slot():
+    if g.pop("admitted", False):
+        admission.release()
+
+@app.teardown_request
+def release_admission(exc=None):
+    release_admission_slot()
+
+# Opt-in profiling of admitted requests, by token header or by sampling rate
+profiling_slots = threading.BoundedSemaphore(Config.PROFILE_MAX_CONCURRENT)
+
+@app.before_request
+def start_profiling():
+    if not g.get("admitted"):
+        return None
+
+    token = request.headers.get("X-Profile-Request", "")
+    requested = Config.PROFILE_TOKEN is not None and hmac.compare_digest(token.encode(), Config.PROFILE_TOKEN.encode())
+    if not requested and not (Config.PROFILE_SAMPLE_RATE > 0 and random.random() < Config.PROFILE_SAMPLE_RATE):
+        return None
+
+    deadline = g.deadline
+    g.profiler = RequestProfiler.try_start(
+        route=request.endpoint,
+        stage_getter=lambda: deadline.current_stage,
+        interval=Config.PROFILE_INTERVAL_MS / 1000,
+        slots=profiling_slots,
+    )
+    return None
+
+@app.after_request
+def finish_profiling(response):
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        # A profile that cannot be written must not turn the request into a 500
+        try:
+            path = profiler.finish(Config.PROFILE_DIR, Config.PROFILE_FORMAT)
+        except Exception:
+            app.logger.exception("Writing the profile of %s failed", request.endpoint)
+        else:
+            response.headers["X-Profile-File"] = os.path.basename(path)
+    return response
+
+@app.teardown_request
+def flush_profiling(exc=None):
+    # Requests that ended in an unhandled error skip after_request
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        try:
+            profiler.finish(Config.PROFILE_DIR, Config.PROFILE_FORMAT)
+        except Exception:
+            app.logger.exception("Writing the profile of %s failed", request.endpoint)
+
+@app.route('/admission_stats', methods=['GET'])
+def admission_stats():
+    """
+    Endpoint exposing in-flight, queue depth and shed counters of the admission controller.
+    """
+    return jsonify(admission.stats())
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Python skips atexit handlers on SIGTERM; exiting normally lets the write-behind writer flush
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=Config.FLASK_RELOADER)
     
\ No newline at end of file
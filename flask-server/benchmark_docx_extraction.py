@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of DOCX text extraction: python-docx object model vs the streaming extractor.
+
+Builds a synthetic resume-like document (paragraphs plus tables), then reports wall time
+and peak traced memory for both paths. tracemalloc does not see lxml's C allocations,
+so the python-docx memory figure is a lower bound.
+
+Usage:
+    python benchmark_docx_extraction.py --paragraphs 5000 --tables 200 --repeat 5
+"""
+import argparse
+import io
+import time
+import tracemalloc
+
+from docx import Document
+
+from controllers.text_extractor import extract_text_from_docx
+
+
+def build_document(paragraphs, tables):
+    doc = Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Built and maintained service {i} using Python, Flask and PostgreSQL.")
+        if tables and i % max(1, paragraphs // tables) == 0:
+            table = doc.add_table(rows=4, cols=3)
+            for row in table.rows:
+                for j, cell in enumerate(row.cells):
+                    cell.text = f"Skill {i}-{j}"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def extract_with_python_docx(docx_file):
+    """The previous extraction path: full object model, paragraphs only."""
+    text = ""
+    doc = Document(docx_file)
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + '\n'
+    return text
+
+
+def measure(extractor, payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extractor(io.BytesIO(payload))
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    text = extractor(io.BytesIO(payload))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction paths.")
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = build_document(args.paragraphs, args.tables)
+    print(f"Document: {len(payload) / 1024:.0f} KiB, {args.paragraphs} paragraphs, {args.tables} tables")
+    print(f"{'extractor':<12} {'best time':>10} {'peak memory':>12} {'chars':>10}")
+
+    for name, extractor in (("python-docx", extract_with_python_docx), ("streaming", extract_text_from_docx)):
+        best, peak, chars = measure(extractor, payload, args.repeat)
+        print(f"{name:<12} {best * 1000:>8.1f}ms {peak / 1024 / 1024:>10.1f}MB {chars:>10}")
+
+
+if __name__ == "__main__":
+    main()
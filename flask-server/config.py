@@ -6,4 +6,53 @@ load_dotenv()
 class Config:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     TOGETHER_AI_API_KEY = os.getenv("TOGETHER_AI_API_KEY")
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+
+    # Resume matching cascade: the fast model scores every candidate, and only scores
+    # within MATCH_ESCALATION_MARGIN points of the job threshold are re-scored by the large model
+    MATCH_FAST_MODEL = os.getenv("MATCH_FAST_MODEL", "meta-llama/Meta-Llama-3.1-8B-Instruct-Turbo")
+    MATCH_LARGE_MODEL = os.getenv("MATCH_LARGE_MODEL", "meta-llama/Llama-3.3-70B-Instruct-Turbo")
+    MATCH_ESCALATION_MARGIN = int(os.getenv("MATCH_ESCALATION_MARGIN", "10"))
+
+    # Identical in-flight requests are coalesced; completed results answer retries for this long
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "60"))
+
+    # Admission control for the LLM routes: concurrent requests, waiting requests,
+    # longest queue wait in seconds, and the Retry-After sent with shed (503) responses
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "8"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+
+    # Overall time budget of a request in seconds (callers may lower it with X-Request-Timeout),
+    # and the least budget a stage needs to be started at all
+    REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "120"))
+    DEADLINE_MIN_STAGE_SECONDS = float(os.getenv("DEADLINE_MIN_STAGE_SECONDS", "1"))
+
+    # Opt-in request profiling: a request is profiled when it sends X-Profile-Request equal to
+    # PROFILE_TOKEN (ignored while unset) or is picked by PROFILE_SAMPLE_RATE (0..1).
+    # Profiles are written to PROFILE_DIR as "collapsed" stacks or "speedscope" JSON.
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "collapsed")
+    PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+
+    # Screening results are written in batches every WRITE_BEHIND_FLUSH_INTERVAL seconds (or once
+    # WRITE_BEHIND_MAX_BATCH candidates are pending); aiAnalysis texts of at least ARTIFACT_MIN_BYTES
+    # are stored compressed in AiArtifact and referenced by hash
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "0.5"))
+    WRITE_BEHIND_MAX_BATCH = int(os.getenv("WRITE_BEHIND_MAX_BATCH", "100"))
+    ARTIFACT_MIN_BYTES = int(os.getenv("ARTIFACT_MIN_BYTES", "1024"))
+    # A candidate whose result fails to write on its own (while others succeed) this many times is
+    # logged and dropped; while the database is unreachable, flushes back off up to
+    # WRITE_BEHIND_MAX_BACKOFF seconds, and new results are refused once WRITE_BEHIND_MAX_PENDING
+    # candidates are buffered
+    WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "8"))
+    WRITE_BEHIND_MAX_BACKOFF = float(os.getenv("WRITE_BEHIND_MAX_BACKOFF", "30"))
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv("WRITE_BEHIND_MAX_PENDING", "10000"))
+
+    # The debug reloader serves from a child process that a container stop (SIGTERM to PID 1) never
+    # reaches, so buffered results are only flushed on shutdown with FLASK_RELOADER=false
+    FLASK_RELOADER = os.getenv("FLASK_RELOADER", "true").lower() == "true"
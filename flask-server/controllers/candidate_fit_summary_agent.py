@@ -1,23 +1,14 @@
-import google.generativeai as genai
-from config import Config
+from controllers.llm_client import gemini_generate
 
-# Configure Gemini API key
-genai.configure(api_key=Config.GEMINI_API_KEY)
-
-def candidate_fit_summary(company_name, job_title, cv_summary, final_check_result):
+def candidate_fit_summary(prompts, company_name, job_title, final_check_result, timeout=None):
     """
     Generate a professional candidate fit summary explaining why the candidate is shortlisted for the role.
     Includes insights from the final_check analysis to strengthen reasoning.
     """
-    prompt = f"""
+    task = f"""
         You are part of the recruitment team at {company_name}. A hiring manager is reviewing shortlisted candidates for the role of {job_title}.
 
-        Based on the candidate’s resume summary and the final alignment analysis provided, write a short and professional paragraph (80–100 words) explaining why this candidate is a strong fit for the role.
-
-        Resume Summary:
-        \"\"\"
-        {cv_summary}
-        \"\"\"
+        Based on the candidate’s resume summary above and the final alignment analysis provided, write a short and professional paragraph (80–100 words) explaining why this candidate is a strong fit for the role.
 
         Final Alignment Insights (model-generated):
         \"\"\"
@@ -41,8 +32,13 @@ def candidate_fit_summary(company_name, job_title, cv_summary, final_check_resul
     }
 
     try:
-        analysis_model = genai.GenerativeModel(model_name="gemini-2.0-flash-exp", generation_config=generation_config)
-        response = analysis_model.generate_content(prompt)
-        return response.text.strip()
+        return gemini_generate(
+            model_name="gemini-2.0-flash-exp",
+            generation_config=generation_config,
+            prompt=prompts.prompt("candidate_fit_summary", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("candidate_fit_summary"),
+            on_prompt=prompts.prompt_recorder("candidate_fit_summary")
+        ).strip()
     except Exception as e:
         return f"Error generating summary: {str(e)}"
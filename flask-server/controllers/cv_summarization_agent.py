@@ -1,10 +1,6 @@
-from together import Together
-from config import Config
+from controllers.llm_client import together_chat
 
-# Configure Together API key
-client = Together(api_key=Config.TOGETHER_AI_API_KEY)
-
-def summarize_cv(cv_text):
+def summarize_cv(cv_text, timeout=None):
     """Summarizes the given Resume/ CV text using the Llama-3.3-70B-Instruct-Turbo model."""
 
     prompt = f"""
@@ -31,11 +27,11 @@ def summarize_cv(cv_text):
     """
 
     try:
-        response = client.chat.completions.create(
+        return together_chat(
             model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            timeout=timeout
         )
-        return response.choices[0].message.content
     
     except Exception as e:
         return f"Error: {str(e)}"
\ No newline at end of file
@@ -1,17 +1,13 @@
-from together import Together
-from config import Config
+from controllers.llm_client import together_chat
 import re
 
-# Configure Together API key
-client = Together(api_key=Config.TOGETHER_AI_API_KEY)
-
-def final_check(cv_text):
+def final_check(prompts, timeout=None):
     """ Validates whether the candidate’s claimed skills are actually reflected in their resume.
     Uses Llama-3.3-70B-Instruct-Turbo model for reasoning and legitimacy check. """
 
-    prompt = f"""You are an intelligent and critical HR screening assistant.
+    task = """You are an intelligent and critical HR screening assistant.
 
-        A candidate has submitted their resume. Your task is to evaluate whether the skills they have listed in their "Skills" section are actually reflected or used meaningfully in their projects, work experience, education, or other resume content.
+        A candidate has submitted the resume summarized above. Your task is to evaluate whether the skills they have listed in their "Skills" section are actually reflected or used meaningfully in their projects, work experience, education, or other resume content.
 
         ### Step-by-step Instructions:
 
@@ -30,29 +26,28 @@ def final_check(cv_text):
         5. Provide a final evaluation:
         - If score ≥ 70%, write: "**VALID**: The candidate has genuinely demonstrated most of the claimed skills."
         - If score < 70%, write: "**NOT VALID**: The candidate's claimed skills are mostly unsupported or unclear."
-
-        ### Resume:
-        {cv_text}
     """
 
     try:
-        response = client.chat.completions.create(
+        return together_chat(
             model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            messages=[{"role": "user", "content": prompt}]
+            messages=prompts.messages("final_check", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("final_check"),
+            on_prompt=prompts.prompt_recorder("final_check")
         )
-        return response.choices[0].message.content
     
     except Exception as e:
         return f"Error: {str(e)}"
 
-def final_check_score(cv_text):
+def final_check_score(prompts, timeout=None):
     """
     Validates whether the candidate’s claimed skills are reflected in the resume.
     Returns only the Skill Legitimacy Score as an integer.
     """
-    prompt = f"""You are an intelligent and critical HR screening assistant.
+    task = """You are an intelligent and critical HR screening assistant.
 
-        A candidate has submitted their resume. Your task is to evaluate whether the skills they have listed in their "Skills" section are actually reflected or used meaningfully in their projects, work experience, education, or other resume content.
+        A candidate has submitted the resume summarized above. Your task is to evaluate whether the skills they have listed in their "Skills" section are actually reflected or used meaningfully in their projects, work experience, education, or other resume content.
 
         ### Step-by-step Instructions:
 
@@ -65,9 +60,6 @@ def final_check_score(cv_text):
         3. Then calculate the **Skill Legitimacy Score** as:
         \\[ (Number of Skills Validated / Total Claimed Skills) × 100 \\]%
 
-        ### Resume:
-        {cv_text}
-
         ### Output:
         - Only return the Skill Legitimacy Score as a percentage (e.g., 83%).
         - Do not include any other text or explanation.
@@ -76,11 +68,13 @@ def final_check_score(cv_text):
     """
 
     try:
-        response = client.chat.completions.create(
+        output_text = together_chat(
             model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            messages=[{"role": "user", "content": prompt}]
+            messages=prompts.messages("final_check_score", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("final_check_score"),
+            on_prompt=prompts.prompt_recorder("final_check_score")
         )
-        output_text = response.choices[0].message.content
 
         # Extract the first percentage number (e.g., 83%)
         match = re.search(r"(\d+)\s*%", output_text)
@@ -1,10 +1,10 @@
-from together import Together
-from config import Config
+import json
+import logging
+from controllers.llm_client import together_chat
 
-# Configure Together API key
-client = Together(api_key=Config.TOGETHER_AI_API_KEY)
+logger = logging.getLogger(__name__)
 
-def summarize_jd(jd_text):
+def summarize_jd(jd_text, timeout=None):
     """Summarizes the given job description text using the Llama-3.3-70B-Instruct-Turbo model."""
 
     prompt = f"""You are a recruitment assistant. Your task is to read the job description and extract important details in a clean, readable format.
@@ -24,11 +24,58 @@ def summarize_jd(jd_text):
     """
 
     try:
-        response = client.chat.completions.create(
+        return together_chat(
             model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            timeout=timeout
         )
-        return response.choices[0].message.content
     
     except Exception as e:
-        return f"Error: {str(e)}"
\ No newline at end of file
+        return f"Error: {str(e)}"
+
+def build_jd_profile(jd_text, timeout=None):
+    """
+    Extracts a structured requirement profile (skills, seniority, must-haves) from the job description.
+    Returns the raw profile dict, or None if the model output is not valid JSON.
+    """
+
+    prompt = f"""You are a recruitment assistant. Read the job description and extract its requirements as a JSON object matching exactly this schema:
+
+        {{
+        "skills": [],
+        "seniority": "",
+        "minYears": null,
+        "mustHaves": []
+        }}
+
+        - "skills": short names of the technical or domain skills asked for (e.g., "Python", "React", "AWS"), one skill per entry.
+        - "seniority": one of "intern", "entry", "mid", "senior", "lead", or "" if not mentioned.
+        - "minYears": the minimum years of experience as a number, or null if not mentioned.
+        - "mustHaves": short names of the skills, tools or qualifications the description marks as required or mandatory.
+
+        Only use what is explicitly stated. Return only the JSON. Do not include any explanation, comments or markdown formatting.
+
+        Job Description:
+        {jd_text}
+    """
+
+    try:
+        output_text = together_chat(
+            model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
+            messages=[{"role": "user", "content": prompt}],
+            timeout=timeout
+        )
+
+        # Strip markdown fences the model sometimes adds
+        output_text = output_text.strip()
+        if output_text.startswith("```"):
+            output_text = output_text.removeprefix("```").removeprefix("json").strip()
+        if output_text.endswith("```"):
+            output_text = output_text.removesuffix("```").strip()
+
+        return json.loads(output_text)
+
+    except Exception:
+        # The job keeps its previous profile; ranking uses that until the JD is summarized again
+        logger.exception("Extracting the JD requirement profile failed")
+        return None
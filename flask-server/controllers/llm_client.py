@@ -0,0 +1,68 @@
+import math
+from functools import lru_cache
+
+import google.generativeai as genai
+from together import Together
+from config import Config
+
+# Configure API keys
+client = Together(api_key=Config.TOGETHER_AI_API_KEY)
+genai.configure(api_key=Config.GEMINI_API_KEY)
+
+# Distinct timeout buckets (whole seconds) that keep their own client on SDKs without per-request options
+TIMEOUT_CLIENT_CACHE_SIZE = 16
+
+@lru_cache(maxsize=TIMEOUT_CLIENT_CACHE_SIZE)
+def _bucketed_client(timeout_seconds):
+    return Together(api_key=Config.TOGETHER_AI_API_KEY, timeout=timeout_seconds)
+
+def _chat_client(timeout):
+    """The shared client, bound to `timeout` seconds without opening a new connection pool per call."""
+    if timeout is None:
+        return client
+    if hasattr(client, "with_options"):
+        return client.with_options(timeout=timeout)
+    # Round down so the call never outlives the caller's budget
+    return _bucketed_client(max(1, math.floor(timeout)))
+
+def together_chat(model, messages, timeout=None, on_usage=None, on_prompt=None):
+    """
+    Runs a Together chat completion and returns the message content. `timeout` is in seconds;
+    `on_usage(prompt_tokens, cached_tokens)` receives the reported token usage and
+    `on_prompt(content)` the message content as sent, in order.
+    """
+
+    if on_prompt is not None:
+        on_prompt("".join(message["content"] for message in messages))
+
+    response = _chat_client(timeout).chat.completions.create(model=model, messages=messages)
+
+    if on_usage is not None:
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        if cached_tokens is None:
+            cached_tokens = getattr(usage, "cached_tokens", None)
+        on_usage(getattr(usage, "prompt_tokens", None), cached_tokens)
+
+    return response.choices[0].message.content
+
+def gemini_generate(model_name, generation_config, prompt, timeout=None, on_usage=None, on_prompt=None):
+    """
+    Runs a Gemini generation and returns the response text. `timeout` is in seconds;
+    `on_usage(prompt_tokens, cached_tokens)` receives the reported token usage and
+    `on_prompt(content)` the prompt as sent.
+    """
+
+    if on_prompt is not None:
+        on_prompt(prompt)
+
+    model = genai.GenerativeModel(model_name=model_name, generation_config=generation_config)
+    request_options = {"timeout": timeout} if timeout is not None else None
+    response = model.generate_content(prompt, request_options=request_options)
+
+    if on_usage is not None:
+        usage = getattr(response, "usage_metadata", None)
+        on_usage(getattr(usage, "prompt_token_count", None), getattr(usage, "cached_content_token_count", None))
+
+    return response.text
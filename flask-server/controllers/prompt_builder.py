@@ -0,0 +1,76 @@
+import hashlib
+from textwrap import dedent
+
+SYSTEM_INSTRUCTIONS = """You are part of an AI recruitment screening team. You are given a Job Description (JD) summary and a Candidate Resume (CV) summary.
+
+Use only the content explicitly present in these summaries. Do not infer, assume or fabricate skills, experience or qualifications that are not directly stated.
+
+The task after the summaries tells you exactly what to produce."""
+
+
+class ScreeningPrompts:
+    """
+    Builds the prompts of one screening so every agent shares a byte-identical prefix
+    (system instructions, JD summary, CV summary) followed by its task-specific part.
+    Keeping the prefix stable lets provider-side prompt caching reuse it across stages.
+    """
+
+    def __init__(self, jd_summary, cv_summary):
+        self.jd_summary = (jd_summary or "").strip()
+        self.cv_summary = (cv_summary or "").strip()
+        self.prefix_hashes = {}
+        self.usage = {}
+
+    def shared_prefix(self):
+        return (
+            f"{SYSTEM_INSTRUCTIONS}\n\n"
+            f"### Job Description Summary:\n{self.jd_summary}\n\n"
+            f"### Candidate Resume Summary:\n{self.cv_summary}\n\n"
+            f"### Task:\n"
+        )
+
+    def prompt(self, stage, task):
+        """Returns the full prompt for `stage`."""
+        return self.shared_prefix() + dedent(task).strip() + "\n"
+
+    def messages(self, stage, task):
+        """Chat-completion form of `prompt`."""
+        return [{"role": "user", "content": self.prompt(stage, task)}]
+
+    def usage_recorder(self, stage):
+        """Returns the `on_usage` callback for the LLM client; cached_tokens is None when the provider does not report it."""
+        def record(prompt_tokens, cached_tokens):
+            self.usage[stage] = (prompt_tokens, cached_tokens)
+        return record
+
+    def prompt_recorder(self, stage):
+        """
+        Returns the `on_prompt` callback for the LLM client. It fingerprints the leading bytes of
+        the content actually sent, so a stage whose request does not start with the shared prefix
+        is caught even if it was built without `prompt`.
+        """
+        def record(content):
+            prefix = self.shared_prefix().encode("utf-8")
+            self.prefix_hashes[stage] = hashlib.sha256(content.encode("utf-8")[:len(prefix)]).hexdigest()
+        return record
+
+    def prefix_mismatches(self):
+        """Stages whose sent request did not start with the shared prefix."""
+        expected = hashlib.sha256(self.shared_prefix().encode("utf-8")).hexdigest()
+        return sorted(stage for stage, digest in self.prefix_hashes.items() if digest != expected)
+
+    def prefix_is_stable(self):
+        return not self.prefix_mismatches()
+
+    def cache_stats(self):
+        reported = [(p, c) for p, c in self.usage.values() if p and c is not None]
+        prompt_tokens = sum(p for p, _ in reported)
+        cached_tokens = sum(c for _, c in reported)
+        return {
+            "prefix_stable": self.prefix_is_stable(),
+            "prefix_mismatches": self.prefix_mismatches(),
+            "stages": sorted(self.prefix_hashes),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "cached_token_ratio": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else None,
+        }
@@ -1,23 +1,13 @@
-import google.generativeai as genai
-from config import Config
+from controllers.llm_client import gemini_generate
 
-# Configure Gemini API key
-genai.configure(api_key=Config.GEMINI_API_KEY)
 
-
-def generate_rejection_email(company_name, candidate_name, jd_summary, cv_summary):
+def generate_rejection_email(prompts, company_name, candidate_name, timeout=None):
     """
     Generate ONLY the rejection reasons in bullet points.
     Returns just why they were rejected, not full email content.
     """
-    prompt = f"""
-        A candidate named {candidate_name} has been rejected based on job requirements vs their qualifications.
-
-        Job Description Summary:
-        {jd_summary}
-
-        Candidate Resume Summary:
-        {cv_summary}
+    task = f"""
+        A candidate named {candidate_name} has been rejected based on the job requirements vs their qualifications summarized above.
 
         Generate exactly 4-5 bullet points explaining why this candidate was rejected.
 
@@ -40,12 +30,14 @@ def generate_rejection_email(company_name, candidate_name, jd_summary, cv_summar
     }
 
     try:
-        analysis_model = genai.GenerativeModel(
+        email_body = gemini_generate(
             model_name="gemini-2.0-flash-exp",
-            generation_config=generation_config
-        )
-        response = analysis_model.generate_content(prompt)
-        email_body = response.text.strip()
+            generation_config=generation_config,
+            prompt=prompts.prompt("rejection_email", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("rejection_email"),
+            on_prompt=prompts.prompt_recorder("rejection_email")
+        ).strip()
 
         # Now manually create the full email JSON with subject, greeting, and closing
         subject = f"Update on Your Application for {company_name}"
@@ -65,12 +57,12 @@ def generate_rejection_email(company_name, candidate_name, jd_summary, cv_summar
 
     
     
-def generate_rejection_email_lastphase(company_name, candidate_name, final_check_result):
+def generate_rejection_email_lastphase(prompts, company_name, candidate_name, final_check_result, timeout=None):
     """
     Generate ONLY the rejection reasons in bullet points for final phase rejection.
     Returns just why they were rejected, not full email content.
     """
-    prompt = f"""
+    task = f"""
         A candidate named {candidate_name} has been rejected in the final evaluation phase.
 
         Final Evaluation Summary:
@@ -97,12 +89,14 @@ def generate_rejection_email_lastphase(company_name, candidate_name, final_check
     }
 
     try:
-        analysis_model = genai.GenerativeModel(
+        email_body = gemini_generate(
             model_name="gemini-2.0-flash-exp",
-            generation_config=generation_config
-        )
-        response = analysis_model.generate_content(prompt)
-        email_body = response.text.strip()
+            generation_config=generation_config,
+            prompt=prompts.prompt("rejection_email_lastphase", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("rejection_email_lastphase"),
+            on_prompt=prompts.prompt_recorder("rejection_email_lastphase")
+        ).strip()
 
         # Now manually create the full email JSON with subject, greeting, and closing
         subject = f"Update on Your Application for {company_name}"
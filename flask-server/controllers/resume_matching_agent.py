@@ -1,23 +1,13 @@
 import re
-from together import Together
+from controllers.llm_client import together_chat
 from config import Config
+from utils.deadline import DeadlineExceeded, remaining
 
-# Configure Together API key
-client = Together(api_key=Config.TOGETHER_AI_API_KEY)
+def match_jd_cv(prompts, model=Config.MATCH_LARGE_MODEL, timeout=None, stage="match_jd_cv"):
+    """Scores how well the CV summary fits the JD summary (0-100) using the given model."""
 
-def match_jd_cv(jd_summary, cv_summary):
-    prompt = f"""
-        You are a recruitment evaluation assistant. Your task is to strictly compare a Job Description (JD) summary and a Candidate Resume (CV) summary. 
-
-        You must only use the content explicitly present in both summaries. Do not infer or assume anything that is not directly stated.
-
-        Here are the inputs:
-
-        ### Job Description Summary:
-        {jd_summary}
-
-        ### Candidate Resume Summary:
-        {cv_summary}
+    task = """
+        You are a recruitment evaluation assistant. Your task is to strictly compare the Job Description (JD) summary and the Candidate Resume (CV) summary above.
 
         Evaluate the following 3 key criteria **only**:
 
@@ -43,12 +33,13 @@ def match_jd_cv(jd_summary, cv_summary):
         - Do NOT include any explanations, comments, labels, or formatting other than the score itself.
     """
 
-
-    response = client.chat.completions.create(
-        model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-        messages=[{"role": "user", "content": prompt}]
+    full_response = together_chat(
+        model=model,
+        messages=prompts.messages(stage, task),
+        timeout=timeout,
+        on_usage=prompts.usage_recorder(stage),
+        on_prompt=prompts.prompt_recorder(stage)
     )
-    full_response = response.choices[0].message.content
 
     # Extract fit score using regex
     match = re.search(r"(\d+)\s*%", full_response, re.IGNORECASE)
@@ -56,3 +47,25 @@ def match_jd_cv(jd_summary, cv_summary):
         return int(match.group(1))  # Return just the number as a string
     else:
         return "Fit score not found"
+
+
+def match_jd_cv_cascade(prompts, threshold, margin=Config.MATCH_ESCALATION_MARGIN, deadline=None):
+    """
+    Scores the candidate with the fast model first and escalates to the large model
+    only when the fast score is within `margin` points of the job threshold.
+    Returns a tuple of (matching_score, tier) where tier is "fast" or "large".
+    """
+    try:
+        fast_score = match_jd_cv(prompts, model=Config.MATCH_FAST_MODEL, timeout=remaining(deadline), stage="match_jd_cv_fast")
+    except Exception as e:
+        # A timeout caused by the request deadline leaves no budget for the large model
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(deadline.current_stage) from e
+        fast_score = None
+
+    # Clear accept/reject decisions are kept; borderline, failed or unparsable scores are escalated
+    if isinstance(fast_score, int) and abs(fast_score - threshold) > margin:
+        return fast_score, "fast"
+
+    large_score = match_jd_cv(prompts, model=Config.MATCH_LARGE_MODEL, timeout=remaining(deadline), stage="match_jd_cv_large")
+    return large_score, "large"
@@ -1,7 +1,6 @@
-from together import Together
-from config import Config
+from controllers.llm_client import together_chat
 
-def parse_resume(cv_text):
+def parse_resume(cv_text, timeout=None):
     """Parses the given Resume/CV text using the Llama-3.3-70B-Instruct-Turbo model."""
     
     prompt = f"""
@@ -63,11 +62,10 @@ def parse_resume(cv_text):
 
 
     try:
-        client = Together(api_key=Config.TOGETHER_AI_API_KEY)
-        response = client.chat.completions.create(
+        return together_chat(
             model="meta-llama/Llama-3.3-70B-Instruct-Turbo",
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            timeout=timeout
         )
-        return response.choices[0].message.content
     except Exception as e:
         return f"Error: {str(e)}"
\ No newline at end of file
@@ -1,16 +1,12 @@
-import google.generativeai as genai
-from config import Config
+from controllers.llm_client import gemini_generate
 
-# Configure Gemini API key
-genai.configure(api_key=Config.GEMINI_API_KEY)
-
-def generate_selection_email(company_name, candidate_name, job_title, candidate_summary_fit):
+def generate_selection_email(prompts, company_name, candidate_name, job_title, candidate_summary_fit, timeout=None):
     """
     Generate only the content explaining why the candidate was selected by AI screening.
     Returns just the selection reasons, not full email structure.
     """
 
-    prompt = f"""
+    task = f"""
         A candidate named {candidate_name} has applied for the position of {job_title} and has been shortlisted through AI screening.
 
         Here is the candidate's fit summary:
@@ -37,12 +33,14 @@ def generate_selection_email(company_name, candidate_name, job_title, candidate_
     }
 
     try:
-        analysis_model = genai.GenerativeModel(
+        email_body = gemini_generate(
             model_name="gemini-2.0-flash-exp",
-            generation_config=generation_config
-        )
-        response = analysis_model.generate_content(prompt)
-        email_body = response.text.strip()
+            generation_config=generation_config,
+            prompt=prompts.prompt("selection_email", task),
+            timeout=timeout,
+            on_usage=prompts.usage_recorder("selection_email"),
+            on_prompt=prompts.prompt_recorder("selection_email")
+        ).strip()
 
         # Now manually create the full email JSON with subject, greeting, and closing
         subject = f"Update on Your Application for {company_name}"
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import re
+
+import numpy as np
+
+SENIORITY_LEVELS = ("intern", "entry", "mid", "senior", "lead")
+
+# Expected years of experience per level as (minimum, maximum); None means no upper bound
+SENIORITY_YEARS = {
+    "intern": (0.0, 1.0),
+    "entry": (0.0, 2.0),
+    "mid": (2.0, 5.0),
+    "senior": (5.0, None),
+    "lead": (8.0, None),
+}
+
+# Vector layout and scoring weights
+MUST_HAVE_WEIGHT = 2.0
+SKILL_WEIGHT = 1.0
+SKILLS_SHARE = 0.8
+SENIORITY_SHARE = 0.2
+UNKNOWN_SENIORITY_FIT = 0.5
+
+STOPWORDS = {"and", "or", "the", "of", "in", "with", "for", "a", "an", "to", "on", "experience", "knowledge"}
+
+
+def normalize_profile(raw):
+    """
+    Turns the model-extracted requirement profile into the stored form:
+    deduplicated skill and must-have terms, a known seniority level and a numeric minimum of years.
+    Returns None if the model output is not a JSON object.
+    """
+    if not isinstance(raw, dict):
+        return None
+
+    def terms(values):
+        # Lists are expected; a bare "Python, React" string is split rather than read per character
+        if isinstance(values, str):
+            values = re.split(r"[,;\n]", values)
+        elif not isinstance(values, list):
+            values = []
+        seen = []
+        for value in values:
+            if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+                continue
+            term = str(value).strip()
+            if term and term.lower() not in [t.lower() for t in seen]:
+                seen.append(term)
+        return seen
+
+    must_haves = terms(raw.get("mustHaves"))
+    skills = [s for s in terms(raw.get("skills")) if s.lower() not in [m.lower() for m in must_haves]]
+
+    seniority = str(raw.get("seniority") or "").strip().lower()
+    if seniority not in SENIORITY_LEVELS:
+        seniority = ""
+
+    try:
+        min_years = float(raw.get("minYears")) if raw.get("minYears") is not None else None
+    except (TypeError, ValueError):
+        min_years = None
+
+    profile = {
+        "skills": skills,
+        "mustHaves": must_haves,
+        "seniority": seniority,
+        "minYears": min_years,
+    }
+    profile["fingerprint"] = profile_fingerprint(profile)
+    return profile
+
+
+def profile_fingerprint(profile):
+    """Identifies the vector layout of a profile; candidate vectors are only comparable within one fingerprint."""
+    layout = json.dumps([profile["mustHaves"], profile["skills"]])
+    return hashlib.sha1(layout.encode("utf-8")).hexdigest()[:12]
+
+
+def profile_weights(profile):
+    return np.array(
+        [MUST_HAVE_WEIGHT] * len(profile["mustHaves"]) + [SKILL_WEIGHT] * len(profile["skills"]),
+        dtype=np.float32,
+    )
+
+
+def seniority_band(profile):
+    """
+    Years of experience the job expects, as (minimum, maximum). The level gives the band;
+    an explicit minYears overrides its minimum.
+    """
+    low, high = SENIORITY_YEARS.get(profile.get("seniority"), (0.0, None))
+    if profile.get("minYears") is not None:
+        low = profile["minYears"]
+        if high is not None and high < low:
+            high = None
+    return low, high
+
+
+def _words(text):
+    """
+    Lowercase word tokens with sentence punctuation stripped ("learning." -> "learning") and
+    plurals folded ("apis" -> "api"); dots inside a token are kept ("node.js", ".net").
+    """
+    words = []
+    for word in re.findall(r"[a-z0-9+#.]+", text.lower()):
+        word = word.rstrip(".")
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if word:
+            words.append(word)
+    return words
+
+
+def _term_present(term, tokens):
+    """Single-word terms must appear as a whole word; longer terms need most of their significant words."""
+    words = [w for w in _words(term) if w not in STOPWORDS]
+    if not words:
+        return False
+    return sum(w in tokens for w in words) / len(words) >= 0.6
+
+
+def extract_years(cv_summary):
+    """Best-effort years of experience from the CV summary, or None if not stated."""
+    text = (cv_summary or "").lower()
+    if "fresher" in text:
+        return 0.0
+    match = re.search(r"(\d+(?:\.\d+)?)\s*\+?\s*(years?|yrs?|months?)", text)
+    if not match:
+        return None
+    value = float(match.group(1))
+    return value / 12 if match.group(2).startswith("month") else value
+
+
+def build_skill_vector(profile, cv_summary):
+    """
+    Compact, LLM-free vector of the candidate against the job profile:
+    one 0/1 entry per must-have then per skill, plus the stated years of experience.
+    """
+    tokens = set(_words(cv_summary or ""))
+    terms = profile["mustHaves"] + profile["skills"]
+    return {
+        "profile": profile["fingerprint"],
+        "v": [int(_term_present(term, tokens)) for term in terms],
+        "years": extract_years(cv_summary),
+    }
+
+
+def rank_candidates(profile, candidates, k):
+    """
+    Ranks candidates by weighted skill coverage and seniority fit. Seniority fit is 1 inside the
+    job's years band, falls off linearly below its minimum and by max/years above its maximum
+    (never below the fit of an unknown candidate).
+
+    `candidates` is a list of (candidate, skill_vector) pairs. Vectors built for another
+    profile fingerprint are skipped. Returns (top-k list of (candidate, score, vector), skipped count).
+    """
+    fingerprint = profile["fingerprint"]
+    current = [(c, v) for c, v in candidates if v and v.get("profile") == fingerprint]
+    skipped = len(candidates) - len(current)
+    if not current:
+        return [], skipped
+
+    weights = profile_weights(profile)
+    matrix = np.array([v["v"] for _, v in current], dtype=np.float32).reshape(len(current), len(weights))
+    skill_scores = matrix @ weights / weights.sum() if weights.size else np.ones(len(current), dtype=np.float32)
+
+    years = np.array([np.nan if v.get("years") is None else v["years"] for _, v in current], dtype=np.float32)
+    low, high = seniority_band(profile)
+    seniority_scores = np.ones(len(current), dtype=np.float32)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if low:
+            seniority_scores = np.minimum(years / low, 1.0)
+        if high:
+            seniority_scores = np.where(years > high, np.maximum(high / years, UNKNOWN_SENIORITY_FIT), seniority_scores)
+    seniority_scores = np.where(np.isnan(years), UNKNOWN_SENIORITY_FIT, seniority_scores)
+
+    scores = SKILLS_SHARE * skill_scores + SENIORITY_SHARE * seniority_scores
+
+    k = min(k, len(current))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(current[i][0], float(scores[i]), current[i][1]) for i in top], skipped
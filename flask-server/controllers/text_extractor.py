@@ -1,7 +1,21 @@
 import requests
 import io
+import zipfile
+from xml.etree.ElementTree import iterparse
 from pypdf import PdfReader
-from docx import Document
+from utils.deadline import stage, remaining
+
+# WordprocessingML tags used by the streaming DOCX extractor
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = W_NS + "body"
+W_P = W_NS + "p"
+W_T = W_NS + "t"
+W_TAB = W_NS + "tab"
+W_BR = W_NS + "br"
+W_TC = W_NS + "tc"
+W_TR = W_NS + "tr"
+W_TBL = W_NS + "tbl"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
 
 # File processing functions
 def extract_text_from_file(uploaded_file):
@@ -23,33 +37,101 @@ def extract_text_from_pdf(pdf_file):
 
 def extract_text_from_docx(docx_file):
     text = ""
-    doc = Document(docx_file)
-    for paragraph in doc.paragraphs:
-        text += paragraph.text + '\n'
+    for line in iter_docx_lines(docx_file):
+        text += line + '\n'
     return text
 
+def iter_docx_lines(docx_file):
+    """
+    Streams `word/document.xml` out of the DOCX zip and yields paragraph and table text
+    in document order. Table cells of a row are separated by " | ", one row per line.
+    Paragraphs nested in text boxes are yielded on their own, before the paragraph that
+    anchors them; the duplicate copy Word keeps in `mc:Fallback` is skipped.
+    """
+    # Stack of open tables -> rows -> cells -> paragraphs, to support nested tables
+    tables = []
+    # One run buffer per open paragraph, since text box paragraphs nest inside a paragraph
+    paragraphs = []
+    fallback_depth = 0
+
+    with zipfile.ZipFile(docx_file) as archive:
+        with archive.open("word/document.xml") as document:
+            body = None
+            for event, elem in iterparse(document, events=("start", "end")):
+                tag = elem.tag
+                if tag == MC_FALLBACK:
+                    fallback_depth += 1 if event == "start" else -1
+                    continue
+                if fallback_depth:
+                    continue
+
+                if event == "start":
+                    if tag == W_BODY:
+                        body = elem
+                    elif tag == W_P:
+                        paragraphs.append([])
+                    elif tag == W_TBL:
+                        tables.append([])
+                    elif tag == W_TR and tables:
+                        tables[-1].append([])
+                    elif tag == W_TC and tables and tables[-1]:
+                        tables[-1][-1].append([])
+                    continue
+
+                if tag in (W_T, W_TAB, W_BR) and paragraphs:
+                    if tag == W_T:
+                        paragraphs[-1].append(elem.text or "")
+                    elif tag == W_TAB:
+                        paragraphs[-1].append("\t")
+                    else:
+                        paragraphs[-1].append("\n")
+                elif tag == W_P:
+                    paragraph = "".join(paragraphs.pop())
+                    if tables and tables[-1] and tables[-1][-1]:
+                        tables[-1][-1][-1].append(paragraph)
+                    else:
+                        yield paragraph
+                elif tag == W_TBL:
+                    rows = tables.pop()
+                    table_lines = [" | ".join(" ".join(p for p in cell if p) for cell in row) for row in rows]
+                    if tables and tables[-1] and tables[-1][-1]:
+                        # Nested table: its rows become paragraphs of the enclosing cell
+                        tables[-1][-1][-1].extend(table_lines)
+                    else:
+                        yield from table_lines
+
+                # Drop finished top-level blocks so memory stays flat for long documents
+                if body is not None and not tables and not paragraphs and tag in (W_P, W_TBL):
+                    body.clear()
+
 def extract_text_from_txt(txt_file):
     return txt_file.read().decode('utf-8')
 
 
-def extract_text_from_s3_url(file_url: str) -> str:
-    response = requests.get(file_url)
+def extract_text_from_s3_url(file_url: str, deadline=None) -> str:
+    """Downloads and extracts the file, within the "download" and "parse" stages of `deadline` if given."""
+    with stage(deadline, "download"):
+        response = requests.get(file_url, timeout=remaining(deadline))
     if response.status_code != 200:
         raise Exception("Failed to download file from S3")
     
     content_type = response.headers.get("Content-Type", "")
     
-    if "pdf" in content_type:
-        # PDF file
-        pdf_file = io.BytesIO(response.content)
-        reader = PdfReader(pdf_file)
-        return "\n".join([page.extract_text() for page in reader.pages])
-    
-    elif "word" in content_type or file_url.endswith(".docx"):
-        import docx
-        from docx import Document
-        doc = Document(io.BytesIO(response.content))
-        return "\n".join([para.text for para in doc.paragraphs])
-    
-    else:
-        raise Exception("Unsupported file format")
\ No newline at end of file
+    with stage(deadline, "parse"):
+        if "pdf" in content_type:
+            # PDF file
+            pdf_file = io.BytesIO(response.content)
+            reader = PdfReader(pdf_file)
+            pages = []
+            for page in reader.pages:
+                # Stop between pages once the budget is spent
+                if deadline is not None:
+                    deadline.check()
+                pages.append(page.extract_text())
+            return "\n".join(pages)
+        
+        elif "word" in content_type or file_url.endswith(".docx"):
+            return "\n".join(iter_docx_lines(io.BytesIO(response.content)))
+        
+        else:
+            raise Exception("Unsupported file format")
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Offline evaluation of the resume matching cascade.
+
+Replays stored JD/CV summary pairs (Job.jdSummary and Candidate.aiAnalysis["cv_summary"])
+through both model tiers and reports score agreement, decision agreement and latency,
+so MATCH_ESCALATION_MARGIN can be tuned.
+
+Usage:
+    python evaluate_matching_cascade.py --limit 50 --margins 5,10,15
+"""
+import argparse
+import statistics
+import time
+
+from config import Config
+from models.db import SessionLocal
+from models.model import CandidateProfile, JobDescription
+from models.artifacts import resolve_artifacts
+from controllers.resume_matching_agent import match_jd_cv
+from controllers.prompt_builder import ScreeningPrompts
+
+
+def load_pairs(limit, job_id=None):
+    """Returns (jd_summary, cv_summary, threshold) tuples for already screened candidates."""
+    db = SessionLocal()
+    query = (
+        db.query(JobDescription.jdSummary, CandidateProfile.aiAnalysis, JobDescription.threshold)
+        .join(JobDescription, JobDescription.id == CandidateProfile.jobId)
+        .filter(CandidateProfile.aiAnalysis.isnot(None), JobDescription.jdSummary.isnot(None))
+    )
+    if job_id is not None:
+        query = query.filter(JobDescription.id == job_id)
+
+    pairs = []
+    for jd_summary, ai_analysis, threshold in query.limit(limit).all():
+        cv_summary = resolve_artifacts(db, ai_analysis).get("cv_summary")
+        if cv_summary:
+            pairs.append((jd_summary, cv_summary, threshold))
+    db.close()
+    return pairs
+
+
+def timed_score(jd_summary, cv_summary, model):
+    start = time.perf_counter()
+    try:
+        score = match_jd_cv(ScreeningPrompts(jd_summary, cv_summary), model=model)
+    except Exception:
+        score = None
+    elapsed = time.perf_counter() - start
+    return (score if isinstance(score, int) else None), elapsed
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the fast/large resume matching cascade on stored summaries.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of stored pairs to replay")
+    parser.add_argument("--job-id", type=int, default=None, help="Only replay candidates of this job")
+    parser.add_argument("--margins", default="5,10,15,20", help="Comma separated escalation margins to simulate")
+    args = parser.parse_args()
+
+    pairs = load_pairs(args.limit, args.job_id)
+    if not pairs:
+        print("No stored JD/CV summary pairs found.")
+        return
+
+    results = []
+    for jd_summary, cv_summary, threshold in pairs:
+        fast_score, fast_latency = timed_score(jd_summary, cv_summary, Config.MATCH_FAST_MODEL)
+        large_score, large_latency = timed_score(jd_summary, cv_summary, Config.MATCH_LARGE_MODEL)
+        results.append((threshold, fast_score, fast_latency, large_score, large_latency))
+
+    # Only pairs the large model scored can serve as reference
+    scored = [r for r in results if r[3] is not None]
+    both = [r for r in scored if r[1] is not None]
+
+    print(f"Replayed pairs: {len(results)} (large scored: {len(scored)}, both scored: {len(both)})")
+    print()
+    print("Latency per tier (seconds)")
+    for name, latencies in (("fast", [r[2] for r in results]), ("large", [r[4] for r in results])):
+        print(f"  {name:<6} mean={statistics.mean(latencies):.2f}  p50={percentile(latencies, 50):.2f}  p95={percentile(latencies, 95):.2f}")
+
+    if both:
+        diffs = [abs(r[1] - r[3]) for r in both]
+        decision_agreement = sum((r[1] >= r[0]) == (r[3] >= r[0]) for r in both) / len(both)
+        print()
+        print("Fast vs large agreement")
+        print(f"  mean |score diff| = {statistics.mean(diffs):.1f}")
+        print(f"  decision agreement = {decision_agreement:.1%}")
+
+    if not scored:
+        return
+
+    print()
+    print("Simulated cascade per margin")
+    print(f"  {'margin':>6}  {'escalated':>9}  {'decision agreement':>18}  {'mean latency':>12}")
+    for margin in (int(m) for m in args.margins.split(",") if m.strip()):
+        escalated = 0
+        agree = 0
+        latencies = []
+        for threshold, fast_score, fast_latency, large_score, large_latency in scored:
+            if fast_score is not None and abs(fast_score - threshold) > margin:
+                final_score = fast_score
+                latencies.append(fast_latency)
+            else:
+                final_score = large_score
+                escalated += 1
+                latencies.append(fast_latency + large_latency)
+            agree += (final_score >= threshold) == (large_score >= threshold)
+
+        print(f"  {margin:>6}  {escalated / len(scored):>9.1%}  {agree / len(scored):>18.1%}  {statistics.mean(latencies):>11.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import hashlib
+import zlib
+
+from .model import AiArtifact
+
+# aiAnalysis fields that hold long model output; the emails the Node server reads stay inline
+ARTIFACT_FIELDS = ("cv_summary", "final_check_result")
+ARTIFACT_REF_KEY = "$artifact"
+
+
+def externalize_artifacts(ai_analysis, min_bytes):
+    """
+    Replaces long text fields of `ai_analysis` with references to content-hashed artifacts.
+    Returns (compact copy of ai_analysis, {hash: (compressed content, size)}).
+    """
+    compact = dict(ai_analysis or {})
+    artifacts = {}
+    for field in ARTIFACT_FIELDS:
+        value = compact.get(field)
+        if not isinstance(value, str):
+            continue
+        data = value.encode("utf-8")
+        if len(data) < min_bytes:
+            continue
+        digest = hashlib.sha256(data).hexdigest()
+        artifacts[digest] = (zlib.compress(data, 6), len(data))
+        compact[field] = {ARTIFACT_REF_KEY: digest}
+    return compact, artifacts
+
+
+def resolve_artifacts(db, ai_analysis):
+    """Returns a copy of `ai_analysis` with artifact references replaced by their text."""
+    resolved = dict(ai_analysis or {})
+    refs = {
+        field: value[ARTIFACT_REF_KEY]
+        for field, value in resolved.items()
+        if isinstance(value, dict) and ARTIFACT_REF_KEY in value
+    }
+    if not refs:
+        return resolved
+
+    rows = db.query(AiArtifact.hash, AiArtifact.content).filter(AiArtifact.hash.in_(set(refs.values()))).all()
+    contents = {row.hash: zlib.decompress(row.content).decode("utf-8") for row in rows}
+    for field, digest in refs.items():
+        resolved[field] = contents.get(digest)
+    return resolved
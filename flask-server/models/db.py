@@ -1,8 +1,26 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from config import Config
+from utils.deadline import DeadlineExceeded
 
 DATABASE_URL = Config.SQLALCHEMY_DATABASE_URI
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine)
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+def commit_within(db, deadline):
+    """
+    Commits the session inside the "db_commit" stage, bounding statements by the remaining budget.
+    Raises DeadlineExceeded only when the commit did not happen; a commit that completes just
+    after the deadline is kept, so callers never report (and clients never retry) stored work.
+    """
+    committed = False
+    try:
+        with deadline.stage("db_commit"):
+            if engine.dialect.name == "postgresql":
+                db.execute(text(f"SET LOCAL statement_timeout = {max(1, int(deadline.remaining() * 1000))}"))
+            db.commit()
+            committed = True
+    except DeadlineExceeded:
+        if not committed:
+            raise
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, Integer, JSON, Table
+from sqlalchemy import Column, Text, Integer, JSON, LargeBinary, Table
 from .db import Base
 
 class CandidateProfile(Base):
@@ -12,6 +12,7 @@ class CandidateProfile(Base):
     status = Column(Text)
     aiAnalysis = Column(JSON)
     aiMailResponse = Column(JSON)
+    skillVector = Column(JSON)  # Candidate vs job requirement profile, used for ranking
     jobId = Column(Integer)
 
 
@@ -24,10 +25,18 @@ class JobDescription(Base):
     role = Column(Text)
     threshold = Column(Integer)
     jdSummary = Column(Text)
+    jdProfile = Column(JSON)  # Structured requirement profile: skills, must-haves, seniority
     companyId = Column(Integer)
 
 class Company(Base):
     __tablename__ = 'Company'
 
     id = Column(Integer, primary_key=True)  # Primary key added
-    name = Column(Text)
\ No newline at end of file
+    name = Column(Text)
+
+class AiArtifact(Base):
+    __tablename__ = 'AiArtifact'
+
+    hash = Column(Text, primary_key=True)  # SHA-256 of the uncompressed text
+    content = Column(LargeBinary)  # zlib-compressed UTF-8 text
+    size = Column(Integer)  # Uncompressed size in bytes
\ No newline at end of file
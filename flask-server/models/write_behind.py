@@ -0,0 +1,228 @@
+import atexit
+import logging
+import threading
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from config import Config
+from .db import SessionLocal
+from .model import CandidateProfile, AiArtifact
+from .artifacts import externalize_artifacts
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindWriter:
+    """
+    Buffers candidate result updates and writes them in batches off the request path.
+
+    Updates are keyed by candidate id (the latest submit for a candidate wins) and flushed
+    every `flush_interval` seconds, or as soon as `max_batch` candidates are pending, as one
+    executemany UPDATE per distinct set of columns. Long aiAnalysis text is stored once per
+    content hash in AiArtifact, compressed, and referenced from aiAnalysis.
+
+    Failed writes are re-queued, with newer values for the same candidate taking precedence.
+    When the database is unreachable (connection errors, timeouts) the batch is re-queued as a
+    whole and flushes back off exponentially up to `max_backoff` seconds, so an outage costs one
+    probe per flush and no results. Any other batch failure is retried one candidate at a time,
+    so a single bad row cannot hold back the rest; a row that fails on its own while others are
+    written is dropped with an error log after `max_attempts` such failures. New candidates are
+    refused once `max_pending` are buffered (see `write_now`).
+    """
+
+    def __init__(self, session_factory, flush_interval, max_batch, artifact_min_bytes,
+                 max_attempts, max_backoff, max_pending):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.artifact_min_bytes = artifact_min_bytes
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._attempts = {}
+        self._failures = 0
+        self._thread = None
+        self._stopped = False
+
+    def submit(self, candidate_id, **values):
+        """
+        Queues column values (status, aiAnalysis, aiMailResponse, skillVector) for the candidate.
+        Returns False, without queueing, if the buffer is full; the caller then owns the write.
+        """
+        with self._cond:
+            if candidate_id not in self._pending and len(self._pending) >= self.max_pending:
+                logger.warning(
+                    "Write-behind buffer full (%d candidates), refusing update of candidate %s",
+                    len(self._pending), candidate_id,
+                )
+                return False
+            self._pending.setdefault(candidate_id, {}).update(values)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+        return True
+
+    def write_now(self, candidate_id, **values):
+        """Writes the candidate's values synchronously, bypassing the buffer; raises on failure."""
+        self._write({candidate_id: values})
+
+    def flush(self):
+        """Writes everything pending now; returns the number of candidates written."""
+        with self._cond:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+
+        written = self._write_batch(batch)
+        with self._cond:
+            self._failures = 0 if written else self._failures + 1
+        return written
+
+    def _write_batch(self, batch):
+        try:
+            self._write(batch)
+        except Exception as e:
+            if len(batch) == 1 or _is_unavailable(e):
+                # One probe per flush while the database is unreachable; nothing is charged to the rows
+                logger.warning("Write-behind flush of %d candidates failed, re-queueing", len(batch), exc_info=True)
+                self._requeue(batch, charge=False)
+                return 0
+            logger.exception("Write-behind flush of %d candidates failed, retrying them one by one", len(batch))
+        else:
+            self._written(batch)
+            return len(batch)
+
+        written = 0
+        failed = {}
+        items = list(batch.items())
+        for index, (candidate_id, values) in enumerate(items):
+            try:
+                self._write({candidate_id: values})
+            except Exception as e:
+                if _is_unavailable(e):
+                    logger.warning("Database unreachable during write-behind retries, re-queueing", exc_info=True)
+                    self._requeue(dict(items[index:]), charge=False)
+                    break
+                logger.warning("Write-behind update of candidate %s failed", candidate_id, exc_info=True)
+                failed[candidate_id] = values
+            else:
+                self._written([candidate_id])
+                written += 1
+
+        # Only a row that fails on its own while others are written counts towards dropping it
+        self._requeue(failed, charge=written > 0)
+        return written
+
+    def _written(self, candidate_ids):
+        with self._cond:
+            for candidate_id in candidate_ids:
+                self._attempts.pop(candidate_id, None)
+
+    def _requeue(self, batch, charge):
+        with self._cond:
+            for candidate_id, values in batch.items():
+                if charge:
+                    attempts = self._attempts.get(candidate_id, 0) + 1
+                    if attempts >= self.max_attempts:
+                        self._attempts.pop(candidate_id, None)
+                        # Dead letter: the result is lost, the log keeps what would have been written
+                        logger.error(
+                            "Dropping write-behind update of candidate %s after %d failed attempts (columns: %s)",
+                            candidate_id, attempts, ", ".join(sorted(values)),
+                        )
+                        continue
+                    self._attempts[candidate_id] = attempts
+                self._pending[candidate_id] = {**values, **self._pending.get(candidate_id, {})}
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._failures:
+                    # Nothing could be written last time; only stop() cuts the backoff short
+                    self._cond.wait_for(lambda: self._stopped, timeout=self._backoff())
+                elif not self._stopped and len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                if self._stopped:
+                    return
+            self.flush()
+
+    def _backoff(self):
+        return min(self.flush_interval * 2 ** self._failures, self.max_backoff)
+
+    def _write(self, batch):
+        groups = {}
+        artifacts = {}
+        for candidate_id, values in batch.items():
+            values = dict(values)
+            if "aiAnalysis" in values:
+                values["aiAnalysis"], row_artifacts = externalize_artifacts(values["aiAnalysis"], self.artifact_min_bytes)
+                artifacts.update(row_artifacts)
+            # Bind names must differ from the column names they set
+            params = {"b_id": candidate_id, **{f"b_{column}": value for column, value in values.items()}}
+            groups.setdefault(tuple(sorted(values)), []).append(params)
+
+        db = self.session_factory()
+        try:
+            if artifacts:
+                # Content-hashed, so an existing row already holds the same text
+                existing = set(db.scalars(select(AiArtifact.hash).where(AiArtifact.hash.in_(artifacts.keys()))))
+                db.add_all(
+                    AiArtifact(hash=digest, content=content, size=size)
+                    for digest, (content, size) in artifacts.items()
+                    if digest not in existing
+                )
+                db.flush()
+
+            # Core UPDATE keyed on the id: a candidate deleted in the meantime matches no row and is
+            # skipped, where the ORM bulk UPDATE by primary key raises StaleDataError for the batch
+            for columns, params in groups.items():
+                db.execute(_update_statement(columns), params)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+def _is_unavailable(error):
+    """Connection loss, timeouts and similar transient database errors, as opposed to bad data."""
+    if isinstance(error, (OperationalError, InterfaceError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def _update_statement(columns):
+    table = CandidateProfile.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values({column: bindparam(f"b_{column}") for column in columns})
+    )
+
+
+result_writer = WriteBehindWriter(
+    SessionLocal,
+    flush_interval=Config.WRITE_BEHIND_FLUSH_INTERVAL,
+    max_batch=Config.WRITE_BEHIND_MAX_BATCH,
+    artifact_min_bytes=Config.ARTIFACT_MIN_BYTES,
+    max_attempts=Config.WRITE_BEHIND_MAX_ATTEMPTS,
+    max_backoff=Config.WRITE_BEHIND_MAX_BACKOFF,
+    max_pending=Config.WRITE_BEHIND_MAX_PENDING,
+)
+
+# Don't lose buffered results on a clean shutdown
+atexit.register(result_writer.stop)
@@ -1,14 +1,27 @@
-from flask import request, jsonify
+import logging
+
+from flask import request, jsonify, g
 from models.db import SessionLocal
 from models.model import CandidateProfile, JobDescription, Company
+from models.write_behind import result_writer
 from controllers.text_extractor import extract_text_from_s3_url
 from controllers.cv_summarization_agent import summarize_cv
-from controllers.resume_matching_agent import match_jd_cv
+from controllers.resume_matching_agent import match_jd_cv_cascade
 from controllers.candidate_fit_summary_agent import candidate_fit_summary
 from controllers.rejection_feedback_agent import generate_rejection_email, generate_rejection_email_lastphase
 from controllers.selection_feedback_agent import generate_selection_email
 from controllers.final_check_agent import final_check, final_check_score
+from controllers.prompt_builder import ScreeningPrompts
+from controllers.skill_profile import build_skill_vector
+from utils.single_flight import SingleFlight, SingleFlightTimeout
+from utils.deadline import DeadlineExceeded
+from config import Config
  
+# Concurrent or retried screenings of the same candidate share one pipeline run; only successful results are recorded
+screening_flight = SingleFlight(ttl=Config.IDEMPOTENCY_TTL_SECONDS, should_record=lambda result: result[1] < 400)
+
+logger = logging.getLogger(__name__)
+
 def analyzing_candidate_route(app):
     @app.route('/candidate_screening', methods=['POST'])
     def shortlisting_candidate():
@@ -19,6 +32,9 @@ def analyzing_candidate_route(app):
         - Extracts and summarizes resume
         - Compares resume with JD
         - Makes final selection decision
+        Identical requests for the same email are coalesced into a single screening.
+        Every stage runs within the request deadline; if it runs out, a 504 reports the
+        stage and the partial analysis.
         """
 
         # Get candidate email from form
@@ -26,13 +42,50 @@ def analyzing_candidate_route(app):
         if not email:
             return jsonify({"error": "Email is required"}), 400
 
-        db = SessionLocal()
-
+        deadline = g.deadline
+        try:
+            result, status = screening_flight.do(
+                ("candidate_screening", email),
+                lambda: screen_candidate(email, deadline),
+                timeout=deadline.remaining(),
+                on_join=g.get("release_admission")
+            )
+        except SingleFlightTimeout:
+            # A duplicate of a screening already running, with a shorter budget than the original
+            return jsonify({"error": "Screening did not finish within the request deadline", "stage": "await_duplicate"}), 504
+        return jsonify(result), status
+
+
+# Not recorded by screening_flight (status >= 400), so a retry screens again
+UNSAVED_RESPONSE = ({"error": "Screening result could not be saved, please retry"}, 503)
+
+
+def save_result(candidate_id, **values):
+    """
+    Queues the screening result for the write-behind writer, or writes it directly when its
+    buffer is full. Returns False if the result could not be saved.
+    """
+    if result_writer.submit(candidate_id, **values):
+        return True
+    try:
+        result_writer.write_now(candidate_id, **values)
+    except Exception:
+        logger.exception("Saving the screening result of candidate %s failed", candidate_id)
+        return False
+    return True
+
+
+def screen_candidate(email, deadline):
+    """Runs the screening pipeline for the candidate and returns (response body, status code)."""
+
+    db = SessionLocal()
+    ai_analysis = {}
+
+    try:
         # Fetch candidate from DB
         candidate = db.query(CandidateProfile).filter_by(email=email).first()
         if not candidate:
-            db.close()
-            return jsonify({"error": "Candidate not found"}), 404
+            return {"error": "Candidate not found"}, 404
 
         # Fetch associated job and company details
         job_id = candidate.jobId
@@ -47,87 +100,113 @@ def analyzing_candidate_route(app):
         resume_url = candidate.resume
 
         # Step 1: Extract text from resume (S3 URL)
-        cv_text = extract_text_from_s3_url(resume_url)
+        cv_text = extract_text_from_s3_url(resume_url, deadline)
 
         # Step 2: Summarize CV using LLM agent
-        cv_summary = summarize_cv(cv_text)
+        with deadline.stage("summarize_cv"):
+            cv_summary = summarize_cv(cv_text, timeout=deadline.remaining())
+        ai_analysis["cv_summary"] = cv_summary
+
+        # Compact skill vector against the job's requirement profile, used by /jobs/<id>/rank
+        skill_vector = build_skill_vector(job.jdProfile, cv_summary) if job.jdProfile else None
+
+        # Every later agent prompt starts with the same JD + CV prefix so provider prompt caching can reuse it
+        prompts = ScreeningPrompts(jd_text, cv_summary)
 
-        # Step 3: Calculate matching score between JD and CV summary
-        matching_score = match_jd_cv(jd_text, cv_summary)
+        # Step 3: Calculate matching score between JD and CV summary (fast model, large model for borderline cases)
+        with deadline.stage("match_jd_cv"):
+            matching_score, matching_tier = match_jd_cv_cascade(prompts, threshold, deadline=deadline)
+        ai_analysis["matching_score"] = matching_score
+        ai_analysis["matching_tier"] = matching_tier
 
         if matching_score >= threshold:
             # Step 4: Perform final LLM-based check and scoring
-            final_check_result = final_check(cv_summary)
-            final_score = final_check_score(cv_summary)
+            with deadline.stage("final_check"):
+                final_check_result = final_check(prompts, timeout=deadline.remaining())
+            with deadline.stage("final_check_score"):
+                final_score = final_check_score(prompts, timeout=deadline.remaining())
+            ai_analysis["final_score"] = final_score
+            ai_analysis["final_check_result"] = final_check_result
 
             if final_score >= 70:
                 # Candidate is selected for interview
-                fit_summary = candidate_fit_summary(company_name, jd_text, cv_summary, final_check_result)
-                interview_email = generate_selection_email(company_name, candidate_name, job_title, fit_summary)
-
-                candidate.status = "shortlisted"
-                candidate.aiAnalysis = {
-                    "cv_summary": cv_summary,
-                    "matching_score": matching_score,
-                    "final_score": final_score,
-                    "final_check_result": final_check_result,
-                    "candidate_fit_summary": fit_summary,
-                    "ai_selection_email": interview_email.get("body", "")
-                }
-                candidate.aiMailResponse = interview_email
-                db.add(candidate)
-                db.commit()
-                db.close()
-
-                return jsonify({
-                    "message": f"Candidate {candidate_name} added to the database with status 'shortlisted'.",
+                with deadline.stage("candidate_fit_summary"):
+                    fit_summary = candidate_fit_summary(prompts, company_name, job_title, final_check_result, timeout=deadline.remaining())
+                ai_analysis["candidate_fit_summary"] = fit_summary
+                with deadline.stage("selection_email"):
+                    interview_email = generate_selection_email(prompts, company_name, candidate_name, job_title, fit_summary, timeout=deadline.remaining())
+                ai_analysis["ai_selection_email"] = interview_email.get("body", "")
+
+                ai_analysis["prompt_cache"] = prompts.cache_stats()
+                if not save_result(
+                    candidate.id,
+                    status="shortlisted",
+                    aiAnalysis=ai_analysis,
+                    aiMailResponse=interview_email,
+                    skillVector=skill_vector
+                ):
+                    return UNSAVED_RESPONSE
+
+                return {
+                    "message": f"Candidate {candidate_name} screened with status 'shortlisted'. The result is saved in the background.",
                     "status": "Shortlisted",
                     "score": matching_score,
                     "candidate_fit_summary": fit_summary
-                })
+                }, 200
 
             else:
                 # Final score too low — reject in last phase
-                rejection_email = generate_rejection_email_lastphase(company_name, candidate_name, final_check_result)
-
-                candidate.status = "rejected"
-                candidate.aiAnalysis = {
-                    "cv_summary": cv_summary,
-                    "matching_score": matching_score,
-                    "final_score": final_score,
-                    "final_check_result": final_check_result, 
-                    "ai_rejection_email": rejection_email.get("body", "")
-                }
-                candidate.aiMailResponse = rejection_email
-                db.add(candidate)
-                db.commit()
-                db.close()
-
-                return jsonify({
-                    "message": f"Candidate {candidate_name} added to the database with status 'rejected'.",
+                with deadline.stage("rejection_email"):
+                    rejection_email = generate_rejection_email_lastphase(prompts, company_name, candidate_name, final_check_result, timeout=deadline.remaining())
+                ai_analysis["ai_rejection_email"] = rejection_email.get("body", "")
+
+                ai_analysis["prompt_cache"] = prompts.cache_stats()
+                if not save_result(
+                    candidate.id,
+                    status="rejected",
+                    aiAnalysis=ai_analysis,
+                    aiMailResponse=rejection_email,
+                    skillVector=skill_vector
+                ):
+                    return UNSAVED_RESPONSE
+
+                return {
+                    "message": f"Candidate {candidate_name} screened with status 'rejected'. The result is saved in the background.",
                     "status": "Rejected",
                     "score": matching_score,
                     "rejection_email": rejection_email
-                })
+                }, 200
 
         else:
             # Matching score is below threshold — direct rejection
-            rejection_email = generate_rejection_email(company_name, candidate_name, jd_text, cv_summary)
-
-            candidate.status = "rejected"
-            candidate.aiAnalysis = {
-                "cv_summary": cv_summary,
-                "matching_score": matching_score,
-                "ai_rejection_email": rejection_email.get("body", "")
-            }
-            candidate.aiMailResponse = rejection_email
-            db.add(candidate)
-            db.commit()
-            db.close()
-
-            return jsonify({
-                "message": f"Candidate {candidate_name} added to the database with status 'rejected'.",
+            with deadline.stage("rejection_email"):
+                rejection_email = generate_rejection_email(prompts, company_name, candidate_name, timeout=deadline.remaining())
+            ai_analysis["ai_rejection_email"] = rejection_email.get("body", "")
+
+            ai_analysis["prompt_cache"] = prompts.cache_stats()
+            if not save_result(
+                candidate.id,
+                status="rejected",
+                aiAnalysis=ai_analysis,
+                aiMailResponse=rejection_email,
+                skillVector=skill_vector
+            ):
+                return UNSAVED_RESPONSE
+
+            return {
+                "message": f"Candidate {candidate_name} screened with status 'rejected'. The result is saved in the background.",
                 "status": "Rejected",
                 "score": matching_score,
                 "rejection_email": rejection_email
-            })
+            }, 200
+
+    except DeadlineExceeded as e:
+        # Nothing is persisted; report how far the screening got
+        return {
+            "error": "Screening did not finish within the request deadline",
+            "stage": e.stage,
+            "aiAnalysis": ai_analysis
+        }, 504
+
+    finally:
+        db.close()
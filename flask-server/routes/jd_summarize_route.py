@@ -1,16 +1,29 @@
-from flask import request, jsonify
-from models.db import SessionLocal
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import request, jsonify, g
+from models.db import SessionLocal, commit_within
 from models.model import JobDescription
 from models.model import JobDescription
 
 from controllers.text_extractor import extract_text_from_s3_url
-from controllers.jd_summarizing_agent import summarize_jd
+from controllers.jd_summarizing_agent import summarize_jd, build_jd_profile
+from controllers.skill_profile import normalize_profile
+from utils.single_flight import SingleFlight, SingleFlightTimeout
+from utils.deadline import DeadlineExceeded
+from config import Config
+
+# Concurrent or retried summarizations of the same JD file share one run; only successful results are recorded
+jd_summarize_flight = SingleFlight(ttl=Config.IDEMPOTENCY_TTL_SECONDS, should_record=lambda result: result[1] < 400)
+
+# Runs the requirement profile extraction next to the summary; at most one per admitted request
+jd_profile_pool = ThreadPoolExecutor(max_workers=Config.ADMISSION_MAX_IN_FLIGHT, thread_name_prefix="jd-profile")
 
 def jd_summarize_route(app):
     @app.route('/jd_summarize', methods=['POST'])
     def jd_summarize():
         """
-        Endpoint to summarize a job description.
+        Endpoint to summarize a job description and build its requirement profile.
+        Identical requests for the same jd_file are coalesced into a single summarization.
         """
 
         data = request.get_json()
@@ -20,21 +33,58 @@ def jd_summarize_route(app):
         if not jd:
             return jsonify({"error": "Please provide a document file."}), 400
 
-        jd_text = extract_text_from_s3_url(jd)
-        
+        deadline = g.deadline
+        try:
+            result, status = jd_summarize_flight.do(
+                ("jd_summarize", jd),
+                lambda: summarize_job_description(jd, deadline),
+                timeout=deadline.remaining(),
+                on_join=g.get("release_admission")
+            )
+        except SingleFlightTimeout:
+            # A duplicate of a summarization already running, with a shorter budget than the original
+            return jsonify({"error": "Summarization did not finish within the request deadline", "stage": "await_duplicate"}), 504
+        return jsonify(result), status
+
+
+def summarize_job_description(jd, deadline):
+    """Summarizes the JD file, stores the summary on the job and returns (response body, status code)."""
+
+    try:
+        jd_text = extract_text_from_s3_url(jd, deadline)
+
+        # Structured requirements used to rank the job's candidates without LLM calls,
+        # extracted concurrently so the two model calls overlap instead of adding up
+        profile_future = jd_profile_pool.submit(build_jd_profile, jd_text, timeout=deadline.remaining())
+
         # Call the controller to summarize the JD
-        summary = summarize_jd(jd_text)
-
-        db = SessionLocal()
-        data = db.query(JobDescription).filter_by(description=jd).first()
-
-        if not data:
-            return jsonify({"error": "Job description not found"}), 404
-        
-        # Update the job description with the summary
-        data.jdSummary = summary
-        db.add(data)
-        db.commit()
+        with deadline.stage("summarize_jd"):
+            summary = summarize_jd(jd_text, timeout=deadline.remaining())
+
+        with deadline.stage("build_jd_profile"):
+            raw_profile = profile_future.result(timeout=deadline.remaining())
+    except DeadlineExceeded as e:
+        return {"error": "Summarization did not finish within the request deadline", "stage": e.stage}, 504
+
+    db = SessionLocal()
+    data = db.query(JobDescription).filter_by(description=jd).first()
+
+    if not data:
         db.close()
-        
-        return jsonify({"summary": summary})
\ No newline at end of file
+        return {"error": "Job description not found"}, 404
+
+    # Update the job description with the summary
+    data.jdSummary = summary
+    profile = normalize_profile(raw_profile)
+    if profile is not None:
+        data.jdProfile = profile
+    db.add(data)
+    try:
+        commit_within(db, deadline)
+    except DeadlineExceeded as e:
+        db.rollback()
+        return {"error": "Summarization did not finish within the request deadline", "stage": e.stage, "summary": summary}, 504
+    finally:
+        db.close()
+
+    return {"summary": summary}, 200
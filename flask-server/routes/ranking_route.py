@@ -0,0 +1,61 @@
+from flask import request, jsonify
+from models.db import SessionLocal
+from models.model import CandidateProfile, JobDescription
+
+from controllers.skill_profile import rank_candidates
+
+def rank_candidates_route(app):
+    @app.route('/jobs/<int:job_id>/rank', methods=['GET'])
+    def rank_job_candidates(job_id):
+        """
+        Endpoint to rank a job's screened candidates against its requirement profile.
+        Scores the stored skill vectors only, without any LLM calls. Query param `k` (default 10).
+        """
+
+        k = request.args.get("k", default=10, type=int)
+        if k is None or k < 1:
+            return jsonify({"error": "k must be a positive integer"}), 400
+
+        db = SessionLocal()
+        try:
+            job = db.query(JobDescription.jdProfile).filter_by(id=job_id).first()
+            if not job:
+                return jsonify({"error": "Job not found"}), 404
+            if not job.jdProfile:
+                return jsonify({"error": "Job has no requirement profile yet, summarize the JD first"}), 409
+
+            # Only the columns needed for scoring and display
+            rows = db.query(
+                CandidateProfile.id,
+                CandidateProfile.firstName,
+                CandidateProfile.lastName,
+                CandidateProfile.email,
+                CandidateProfile.status,
+                CandidateProfile.skillVector,
+            ).filter_by(jobId=job_id).all()
+        finally:
+            db.close()
+
+        profile = job.jdProfile
+        ranked, skipped = rank_candidates(profile, [(row, row.skillVector) for row in rows], k)
+        terms = profile["mustHaves"] + profile["skills"]
+
+        return jsonify({
+            "jobId": job_id,
+            "profile": profile["fingerprint"],
+            "candidates": len(rows),
+            "unranked": skipped,
+            "ranking": [
+                {
+                    "id": row.id,
+                    "firstName": row.firstName,
+                    "lastName": row.lastName,
+                    "email": row.email,
+                    "status": row.status,
+                    "score": round(score, 4),
+                    "matched": [term for term, hit in zip(terms, vector["v"]) if hit],
+                    "missingMustHaves": [term for term, hit in zip(profile["mustHaves"], vector["v"]) if not hit],
+                }
+                for row, score, vector in ranked
+            ],
+        })
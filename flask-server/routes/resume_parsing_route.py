@@ -1,7 +1,8 @@
-from flask import request, jsonify
+from flask import request, jsonify, g
 
 from controllers.text_extractor import extract_text_from_s3_url
 from controllers.resume_parsing_agent import parse_resume
+from utils.deadline import DeadlineExceeded
 
 def parse_resume_route(app):
     @app.route('/parse_cv', methods=['POST'])
@@ -17,9 +18,14 @@ def parse_resume_route(app):
         if not cv:
             return jsonify({"error": "Please provide a document file."}), 400
 
-        cv_text = extract_text_from_s3_url(cv)
+        deadline = g.deadline
+        try:
+            cv_text = extract_text_from_s3_url(cv, deadline)
 
-        resume = parse_resume(cv_text)
+            with deadline.stage("parse_resume"):
+                resume = parse_resume(cv_text, timeout=deadline.remaining())
+        except DeadlineExceeded as e:
+            return jsonify({"error": "Resume parsing did not finish within the request deadline", "stage": e.stage}), 504
 
         if not resume:
             return jsonify({"error": "Resume parsing failed"}), 500
@@ -0,0 +1,127 @@
+import threading
+import time
+
+from utils.admission import AdmissionController
+from utils.single_flight import SingleFlight
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+def test_sheds_when_the_queue_is_full():
+    admission = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=5)
+    assert admission.acquire()
+    waiter = threading.Thread(target=lambda: admission.acquire() and admission.release())
+    waiter.start()
+    wait_until(lambda: admission.stats()["queue_depth"] == 1)
+
+    assert not admission.acquire()
+    admission.release()
+    waiter.join(5)
+    assert admission.stats()["shed_queue_full"] == 1
+
+
+def test_sheds_when_no_slot_frees_up_in_time():
+    admission = AdmissionController(max_in_flight=1, max_queue=4, queue_timeout=5)
+    assert admission.acquire()
+
+    started = time.monotonic()
+    # The caller's own remaining deadline caps the queue timeout
+    assert not admission.acquire(timeout=0.05)
+    assert time.monotonic() - started < 1
+    assert admission.stats()["shed_timeout"] == 1
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    admission = AdmissionController(max_in_flight=1, max_queue=3, queue_timeout=5)
+    assert admission.acquire()
+    order = []
+
+    def wait_for_slot(name):
+        assert admission.acquire()
+        order.append(name)
+        admission.release()
+
+    waiters = []
+    for name in ("first", "second", "third"):
+        waiter = threading.Thread(target=wait_for_slot, args=(name,))
+        waiter.start()
+        waiters.append(waiter)
+        wait_until(lambda: admission.stats()["queue_depth"] == len(waiters))
+
+    admission.release()
+    for waiter in waiters:
+        waiter.join(5)
+    assert order == ["first", "second", "third"]
+
+
+def test_stats_count_admitted_and_shed_requests():
+    admission = AdmissionController(max_in_flight=2, max_queue=0, queue_timeout=1)
+    assert admission.acquire()
+    assert admission.acquire()
+    assert not admission.acquire()
+    admission.release()
+
+    assert admission.stats() == {
+        "in_flight": 1,
+        "queue_depth": 0,
+        "max_in_flight": 2,
+        "max_queue": 0,
+        "admitted": 2,
+        "shed_queue_full": 1,
+        "shed_timeout": 0,
+    }
+
+
+def test_coalesced_duplicates_do_not_hold_admission_slots():
+    admission = AdmissionController(max_in_flight=2, max_queue=0, queue_timeout=0)
+    flight = SingleFlight(ttl=0)
+    leader_running = threading.Event()
+    finish_leader = threading.Event()
+    results = []
+    joined = threading.Semaphore(0)
+
+    def slow_screening():
+        leader_running.set()
+        finish_leader.wait(5)
+        return "screened"
+
+    def request(fn):
+        assert admission.acquire()
+        held = [True]
+
+        def release_slot():
+            if held.pop():
+                admission.release()
+            joined.release()
+
+        try:
+            results.append(flight.do("candidate@example.com", fn, timeout=5, on_join=release_slot))
+        finally:
+            if held:
+                admission.release()
+
+    leader = threading.Thread(target=request, args=(slow_screening,))
+    leader.start()
+    assert leader_running.wait(5)
+
+    duplicates = [threading.Thread(target=request, args=(slow_screening,)) for _ in range(3)]
+    for duplicate in duplicates:
+        duplicate.start()
+        # The duplicate gives its slot back once it joins, so the next one is admitted too
+        assert joined.acquire(timeout=5)
+        assert admission.stats()["in_flight"] == 1
+
+    # An unrelated request still gets the second slot while the leader and its duplicates run
+    assert admission.acquire(0)
+    admission.release()
+
+    finish_leader.set()
+    for thread in [leader, *duplicates]:
+        thread.join(5)
+    assert results == ["screened"] * 4
+    assert admission.stats()["in_flight"] == 0
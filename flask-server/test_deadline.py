@@ -0,0 +1,77 @@
+import os
+import time
+
+# models.db builds its engine at import time; commit_within only needs the dialect name
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+
+from models.db import commit_within
+from utils.deadline import Deadline, DeadlineExceeded, stage
+
+
+class SlowSession:
+    def __init__(self, seconds, error=None):
+        self.seconds = seconds
+        self.error = error
+        self.committed = False
+
+    def commit(self):
+        time.sleep(self.seconds)
+        if self.error is not None:
+            raise self.error
+        self.committed = True
+
+
+def test_commit_finishing_after_the_deadline_is_not_reported_as_exceeded():
+    db = SlowSession(0.05)
+    commit_within(db, Deadline(0.01))
+    assert db.committed
+
+
+def test_commit_failing_after_the_deadline_is_reported_as_exceeded():
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        commit_within(SlowSession(0.05, RuntimeError("canceling statement due to statement timeout")), Deadline(0.01))
+    assert exc_info.value.stage == "db_commit"
+
+
+def test_stage_is_skipped_when_less_than_min_stage_seconds_remain():
+    deadline = Deadline(0.5, min_stage_seconds=1)
+    ran = []
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        with deadline.stage("final_check"):
+            ran.append(1)
+    assert ran == []
+    assert exc_info.value.stage == "final_check"
+    assert deadline.current_stage is None
+
+
+def test_error_after_the_deadline_is_reported_as_exceeded_with_the_stage():
+    deadline = Deadline(0.01)
+    timeout = TimeoutError("read timed out")
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        with deadline.stage("summarize_cv"):
+            time.sleep(0.02)
+            raise timeout
+    assert exc_info.value.stage == "summarize_cv"
+    assert exc_info.value.__cause__ is timeout
+
+
+def test_error_within_the_budget_is_raised_unchanged():
+    deadline = Deadline(5)
+    with pytest.raises(ValueError):
+        with deadline.stage("parse_resume"):
+            raise ValueError("bad JSON")
+
+
+def test_stage_finishing_after_the_deadline_is_reported_as_exceeded():
+    deadline = Deadline(0.01)
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        with deadline.stage("match_jd_cv"):
+            time.sleep(0.02)
+    assert exc_info.value.stage == "match_jd_cv"
+
+
+def test_stage_helper_is_a_no_op_without_a_deadline():
+    with stage(None, "summarize_jd"):
+        pass
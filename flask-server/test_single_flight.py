@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import SingleFlight, SingleFlightTimeout
+
+
+def run_leader(flight, key, fn):
+    """Starts `fn` as the leader for `key` in a thread; returns the thread and its outcome list."""
+    outcome = []
+
+    def lead():
+        try:
+            outcome.append(flight.do(key, fn))
+        except Exception as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=lead)
+    thread.start()
+    return thread, outcome
+
+
+def blocking(result=None, error=None):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, started, release, calls
+
+
+def test_follower_shares_the_leader_result():
+    flight = SingleFlight(ttl=0)
+    fn, started, release, calls = blocking(result=("screened", 200))
+    leader, outcome = run_leader(flight, "key", fn)
+    assert started.wait(5)
+
+    # Releasing the leader only once the follower has joined keeps the test deterministic
+    assert flight.do("key", lambda: pytest.fail("follower must not run fn"), on_join=release.set) == ("screened", 200)
+    leader.join(5)
+    assert outcome == [("screened", 200)]
+    assert len(calls) == 1
+
+
+def test_follower_receives_the_leader_error():
+    flight = SingleFlight(ttl=0)
+    error = ValueError("model unavailable")
+    fn, started, release, _ = blocking(error=error)
+    leader, outcome = run_leader(flight, "key", fn)
+    assert started.wait(5)
+
+    with pytest.raises(ValueError) as exc_info:
+        flight.do("key", lambda: None, on_join=release.set)
+    leader.join(5)
+    assert exc_info.value is error
+    assert outcome == [error]
+
+
+def test_follower_gives_up_after_its_timeout():
+    flight = SingleFlight(ttl=0)
+    fn, started, release, _ = blocking(result="late")
+    joined = []
+    leader, outcome = run_leader(flight, "key", fn)
+    assert started.wait(5)
+
+    with pytest.raises(SingleFlightTimeout):
+        flight.do("key", lambda: None, timeout=0.05, on_join=lambda: joined.append(1))
+    release.set()
+    leader.join(5)
+    assert joined == [1]
+    assert outcome == ["late"]
+
+
+def test_only_results_passing_should_record_are_kept_for_the_ttl():
+    flight = SingleFlight(ttl=0.2, should_record=lambda result: result[1] < 400)
+
+    assert flight.do("key", lambda: ("failed", 500)) == ("failed", 500)
+    assert flight.do("key", lambda: ("screened", 200)) == ("screened", 200)
+    assert flight.do("key", lambda: ("rescreened", 200)) == ("screened", 200)
+
+    time.sleep(0.25)
+    assert flight.do("key", lambda: ("rescreened", 200)) == ("rescreened", 200)
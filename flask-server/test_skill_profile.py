@@ -0,0 +1,64 @@
+from controllers.skill_profile import build_skill_vector, normalize_profile, rank_candidates
+
+
+def rank_by_years(profile, years_by_name):
+    candidates = [
+        (name, {"profile": profile["fingerprint"], "v": [1], "years": years})
+        for name, years in years_by_name.items()
+    ]
+    ranked, _ = rank_candidates(profile, candidates, len(candidates))
+    return {name: round(score, 3) for name, score, _ in ranked}
+
+
+def test_seniority_level_sets_the_years_band_when_min_years_is_missing():
+    senior = normalize_profile({"skills": ["Python"], "seniority": "senior"})
+    scores = rank_by_years(senior, {"junior": 1.0, "senior": 6.0, "unknown": None})
+    assert scores["senior"] == 1.0
+    assert scores["junior"] < scores["unknown"] < scores["senior"]
+
+    entry = normalize_profile({"skills": ["Python"], "seniority": "entry"})
+    scores = rank_by_years(entry, {"graduate": 0.0, "veteran": 15.0})
+    assert scores["graduate"] > scores["veteran"]
+
+
+def test_min_years_overrides_the_band_minimum():
+    profile = normalize_profile({"skills": ["Python"], "seniority": "mid", "minYears": 4})
+    scores = rank_by_years(profile, {"three": 3.0, "four": 4.0})
+    assert scores["four"] == 1.0
+    assert scores["three"] < 1.0
+
+
+def matched_terms(terms, cv_summary):
+    profile = normalize_profile({"skills": terms})
+    vector = build_skill_vector(profile, cv_summary)
+    return [term for term, hit in zip(profile["skills"], vector["v"]) if hit]
+
+
+def test_terms_match_across_trailing_punctuation_and_plurals():
+    cv_summary = "Built REST APIs in Node.js and C++. Strong in machine learning. Worked with Docker containers."
+    terms = ["REST API", "Machine Learning", "Node.js", "C++", "Docker", "container", "C#", "Kubernetes"]
+    assert matched_terms(terms, cv_summary) == ["REST API", "Machine Learning", "Node.js", "C++", "Docker", "container"]
+
+
+def test_single_word_terms_still_need_a_whole_word():
+    assert matched_terms(["Java", "Go", "AWS"], "JavaScript developer, Google Cloud, AWS.") == ["AWS"]
+
+
+def test_profile_that_is_not_a_json_object_is_rejected():
+    assert normalize_profile(["Python", "React"]) is None
+    assert normalize_profile("Python, React") is None
+    assert normalize_profile(None) is None
+
+
+def test_bare_string_fields_are_split_into_terms():
+    profile = normalize_profile({"skills": "Python, React; AWS", "mustHaves": "Docker", "minYears": "3"})
+    assert profile["skills"] == ["Python", "React", "AWS"]
+    assert profile["mustHaves"] == ["Docker"]
+    assert profile["minYears"] == 3.0
+
+
+def test_unusable_field_values_are_ignored():
+    profile = normalize_profile({"skills": ["Python", {"name": "React"}, None, True], "mustHaves": 5, "minYears": [2]})
+    assert profile["skills"] == ["Python"]
+    assert profile["mustHaves"] == []
+    assert profile["minYears"] is None
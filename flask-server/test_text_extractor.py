@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+from controllers.text_extractor import extract_text_from_docx
+
+NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml"'
+)
+
+
+def make_docx(body_xml):
+    """Minimal DOCX holding only word/document.xml, which is all the extractor reads."""
+    document = f'<?xml version="1.0" encoding="UTF-8"?><w:document {NAMESPACES}><w:body>{body_xml}</w:body></w:document>'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    buffer.seek(0)
+    return buffer
+
+
+def paragraph(text):
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def text_box(*paragraphs_xml):
+    content = "".join(paragraphs_xml)
+    return (
+        "<w:r><mc:AlternateContent>"
+        f"<mc:Choice><w:drawing><wps:txbx><w:txbxContent>{content}</w:txbxContent></wps:txbx></w:drawing></mc:Choice>"
+        f"<mc:Fallback><w:pict><v:textbox><w:txbxContent>{content}</w:txbxContent></v:textbox></w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r>"
+    )
+
+
+def cell(*content_xml):
+    return "<w:tc>" + "".join(content_xml) + "</w:tc>"
+
+
+def table(*rows):
+    return "<w:tbl>" + "".join("<w:tr>" + "".join(row) + "</w:tr>" for row in rows) + "</w:tbl>"
+
+
+def test_text_box_keeps_anchor_paragraph_and_is_emitted_once():
+    body = (
+        "<w:p><w:r><w:t>John Doe, </w:t></w:r>"
+        + text_box(paragraph("Skills: Python"))
+        + "<w:r><w:t>Senior Engineer</w:t></w:r></w:p>"
+        + paragraph("(tail)")
+    )
+
+    assert extract_text_from_docx(make_docx(body)) == "Skills: Python\nJohn Doe, Senior Engineer\n(tail)\n"
+
+
+def test_nested_table_rows_become_cell_text():
+    inner = table([cell(paragraph("Flask")), cell(paragraph("3 years"))])
+    body = (
+        paragraph("Experience")
+        + table(
+            [cell(paragraph("Skill")), cell(paragraph("Details"))],
+            [cell(paragraph("Python")), cell(inner)],
+        )
+        + paragraph("End")
+    )
+
+    assert extract_text_from_docx(make_docx(body)) == "Experience\nSkill | Details\nPython | Flask | 3 years\nEnd\n"
@@ -0,0 +1,147 @@
+import os
+
+# models.db builds its engine at import time; the writer under test gets its own SQLite engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from models.db import Base
+from models.model import AiArtifact, CandidateProfile
+from models.artifacts import ARTIFACT_REF_KEY, resolve_artifacts
+from models.write_behind import WriteBehindWriter
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'write_behind.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add_all(CandidateProfile(id=i, email=f"candidate{i}@example.com", status="pending") for i in (1, 2, 3))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def make_writer(session_factory, **options):
+    settings = dict(flush_interval=60, max_batch=1000, artifact_min_bytes=64,
+                    max_attempts=3, max_backoff=1, max_pending=100)
+    settings.update(options)
+    return WriteBehindWriter(session_factory, **settings)
+
+
+def candidate(session_factory, candidate_id):
+    db = session_factory()
+    try:
+        return db.get(CandidateProfile, candidate_id)
+    finally:
+        db.close()
+
+
+def test_flush_writes_one_executemany_update_per_column_set(session_factory):
+    statements = []
+    engine = session_factory.kw["bind"]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            statements.append((statement, executemany))
+
+    writer = make_writer(session_factory)
+    writer.submit(1, status="shortlisted")
+    writer.submit(2, status="rejected")
+    writer.submit(3, status="rejected", skillVector={"profile": "abc", "v": [1, 0], "years": 2.0})
+    assert writer.flush() == 3
+    writer.stop()
+
+    assert len(statements) == 2
+    assert [executemany for _, executemany in statements].count(True) == 1
+    assert candidate(session_factory, 1).status == "shortlisted"
+    assert candidate(session_factory, 2).status == "rejected"
+    assert candidate(session_factory, 3).skillVector == {"profile": "abc", "v": [1, 0], "years": 2.0}
+
+
+def test_long_analysis_text_is_stored_once_as_an_artifact(session_factory):
+    cv_summary = "Senior Python engineer. " * 20
+    writer = make_writer(session_factory)
+    writer.submit(1, aiAnalysis={"cv_summary": cv_summary, "matching_score": 82})
+    writer.submit(2, aiAnalysis={"cv_summary": cv_summary, "matching_score": 40})
+    writer.flush()
+    writer.stop()
+
+    stored = candidate(session_factory, 1).aiAnalysis
+    assert set(stored["cv_summary"]) == {ARTIFACT_REF_KEY}
+    db = session_factory()
+    try:
+        assert db.query(AiArtifact).count() == 1
+        assert resolve_artifacts(db, stored) == {"cv_summary": cv_summary, "matching_score": 82}
+    finally:
+        db.close()
+
+
+def test_deleted_candidate_is_skipped_without_failing_the_batch(session_factory):
+    writer = make_writer(session_factory)
+    writer.submit(1, status="shortlisted")
+    writer.submit(99, status="rejected")
+    assert writer.flush() == 2
+    writer.stop()
+
+    assert candidate(session_factory, 1).status == "shortlisted"
+    assert candidate(session_factory, 99) is None
+
+
+def test_requeued_values_merge_with_newer_submits_winning(session_factory):
+    unavailable = [True]
+
+    def flaky_factory():
+        if unavailable[0]:
+            raise OperationalError("connect", {}, Exception("connection refused"))
+        return session_factory()
+
+    writer = make_writer(flaky_factory)
+    writer.submit(1, status="rejected", aiMailResponse={"subject": "Application update"})
+    assert writer.flush() == 0
+
+    unavailable[0] = False
+    writer.submit(1, status="shortlisted")
+    assert writer.flush() == 1
+    writer.stop()
+
+    row = candidate(session_factory, 1)
+    assert row.status == "shortlisted"
+    assert row.aiMailResponse == {"subject": "Application update"}
+
+
+def test_row_failing_alone_is_dropped_after_max_attempts(session_factory):
+    writer = make_writer(session_factory, max_attempts=2)
+    unbindable = object()
+    writer.submit(1, status=unbindable)
+    writer.submit(2, status="shortlisted")
+    assert writer.flush() == 1
+    writer.submit(3, status="rejected")
+    assert writer.flush() == 1
+    assert writer.flush() == 0
+    writer.stop()
+
+    assert candidate(session_factory, 1).status == "pending"
+    assert candidate(session_factory, 3).status == "rejected"
+
+
+def test_submit_refuses_new_candidates_when_buffer_is_full(session_factory):
+    writer = make_writer(session_factory, max_pending=2)
+    assert writer.submit(1, status="shortlisted")
+    assert writer.submit(2, status="rejected")
+    assert not writer.submit(3, status="rejected")
+    # Candidates already buffered still take updates
+    assert writer.submit(1, aiMailResponse={"subject": "Interview"})
+
+    writer.write_now(3, status="rejected")
+    assert writer.flush() == 2
+    writer.stop()
+
+    assert candidate(session_factory, 1).aiMailResponse == {"subject": "Interview"}
+    assert candidate(session_factory, 3).status == "rejected"
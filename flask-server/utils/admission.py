@@ -0,0 +1,67 @@
+import threading
+
+
+class AdmissionController:
+    """
+    Bounds the number of requests running at once.
+
+    Up to `max_in_flight` requests run concurrently and up to `max_queue` more may wait,
+    each for at most `queue_timeout` seconds (or less if the caller's own deadline is
+    closer). Anything beyond that is shed immediately so the caller can answer 503.
+    """
+
+    def __init__(self, max_in_flight, max_queue, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._shed_queue_full = 0
+        self._shed_timeout = 0
+
+    def acquire(self, timeout=None):
+        """Returns True once a slot is taken, False if the request was shed."""
+        wait = self.queue_timeout if timeout is None else max(0, min(timeout, self.queue_timeout))
+
+        with self._cond:
+            if self._in_flight < self.max_in_flight and self._waiting == 0:
+                return self._admit()
+
+            if self._waiting >= self.max_queue or wait <= 0:
+                self._shed_queue_full += 1
+                return False
+
+            self._waiting += 1
+            try:
+                admitted = self._cond.wait_for(lambda: self._in_flight < self.max_in_flight, timeout=wait)
+            finally:
+                self._waiting -= 1
+
+            if not admitted:
+                self._shed_timeout += 1
+                return False
+            return self._admit()
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "admitted": self._admitted,
+                "shed_queue_full": self._shed_queue_full,
+                "shed_timeout": self._shed_timeout,
+            }
+
+    def _admit(self):
+        self._in_flight += 1
+        self._admitted += 1
+        return True
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request stage is skipped or overruns because the time budget ran out."""
+
+    def __init__(self, stage):
+        super().__init__(f"Deadline exceeded during stage '{stage}'")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    Time budget of a single request, handed down to every stage that may block.
+
+    Stages are entered with `with deadline.stage("name"):`. A stage is skipped when less than
+    `min_stage_seconds` remain, and a stage that finishes after the deadline (or fails because
+    of it) is reported as the one that ran out of time.
+    """
+
+    def __init__(self, budget, min_stage_seconds=0):
+        self.expires_at = time.monotonic() + budget
+        self.min_stage_seconds = min_stage_seconds
+        self.current_stage = None
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raises DeadlineExceeded for the current stage if the budget is used up."""
+        if self.expired():
+            raise DeadlineExceeded(self.current_stage)
+
+    @contextmanager
+    def stage(self, name):
+        if self.remaining() < max(self.min_stage_seconds, 1e-3):
+            raise DeadlineExceeded(name)
+        self.current_stage = name
+        try:
+            yield self
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if self.expired():
+                raise DeadlineExceeded(name) from e
+            raise
+        finally:
+            self.current_stage = None
+        if self.expired():
+            raise DeadlineExceeded(name)
+
+
+def stage(deadline, name):
+    """`deadline.stage(name)`, or a no-op when the caller has no deadline."""
+    return deadline.stage(name) if deadline is not None else nullcontext()
+
+
+def remaining(deadline):
+    """Seconds left on the deadline, or None (no timeout) when the caller has no deadline."""
+    return deadline.remaining() if deadline is not None else None
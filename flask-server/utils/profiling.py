@@ -0,0 +1,121 @@
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+
+class RequestProfiler:
+    """
+    Sampling profiler for a single request thread.
+
+    A background thread snapshots the request thread's stack every `interval` seconds and
+    counts identical stacks, tagged with the route and the current stage. Nothing is
+    installed in the interpreter, so requests that are not profiled pay nothing and
+    profiled ones only pay for the sampling thread.
+    """
+
+    def __init__(self, route, stage_getter, interval, slots):
+        self.route = route
+        self.stage_getter = stage_getter
+        self.interval = interval
+        self.slots = slots
+        self.thread_id = threading.get_ident()
+        self.samples = Counter()
+        self.started_at = None
+        self.path = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{route}", daemon=True)
+
+    @classmethod
+    def try_start(cls, route, stage_getter, interval, slots):
+        """
+        Starts a profiler for the calling thread, or returns None when every slot of the
+        `slots` semaphore is taken (bounding overhead when sampled requests overlap).
+        """
+        if not slots.acquire(blocking=False):
+            return None
+        profiler = cls(route, stage_getter, interval, slots)
+        profiler.started_at = time.time()
+        profiler._thread.start()
+        return profiler
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[(self.stage_getter() or "request", tuple(stack))] += 1
+
+    def finish(self, directory, fmt):
+        """Stops sampling and writes the profile once; returns the written path."""
+        if self._stop.is_set():
+            return self.path
+        self._stop.set()
+        self._thread.join()
+        self.slots.release()
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(self.started_at))
+        name = f"{stamp}-{self.route}-{uuid.uuid4().hex[:8]}"
+        if fmt == "speedscope":
+            self.path = os.path.join(directory, name + ".speedscope.json")
+            with open(self.path, "w") as f:
+                json.dump(self._speedscope(name), f)
+        else:
+            self.path = os.path.join(directory, name + ".collapsed")
+            with open(self.path, "w") as f:
+                f.write(self._collapsed())
+        return self.path
+
+    def _collapsed(self):
+        """Brendan Gregg's collapsed-stack format, rooted at route;stage."""
+        lines = []
+        for (stage, stack), count in self.samples.items():
+            frames = [self.route, stage] + [f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack]
+            lines.append(";".join(frame.replace(";", ",") for frame in frames) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def _speedscope(self, name):
+        """speedscope "sampled" profile, with route and stage as the two root frames."""
+        frames = []
+        index = {}
+
+        def frame_id(key, frame):
+            if key not in index:
+                index[key] = len(frames)
+                frames.append(frame)
+            return index[key]
+
+        samples = []
+        weights = []
+        for (stage, stack), count in self.samples.items():
+            ids = [frame_id(("route", self.route), {"name": self.route}), frame_id(("stage", stage), {"name": f"stage: {stage}"})]
+            for code_name, filename, line in stack:
+                ids.append(frame_id((code_name, filename, line), {"name": code_name, "file": filename, "line": line}))
+            samples.append(ids)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "recruitizy-flask-server",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
@@ -0,0 +1,76 @@
+import threading
+import time
+
+
+class SingleFlightTimeout(Exception):
+    """Raised to a caller that gave up waiting for an in-flight call it was coalesced into."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is in flight
+    wait for it and receive the same result (or exception), and can hand back resources they
+    no longer need, such as an admission slot, through `on_join`. Successful results are kept
+    as an idempotency record for `ttl` seconds, so late retries are answered from it.
+    Results are only shared within this process.
+    """
+
+    def __init__(self, ttl=60, should_record=None):
+        self.ttl = ttl
+        self.should_record = should_record or (lambda result: True)
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._records = {}
+
+    def do(self, key, fn, timeout=None, on_join=None):
+        """
+        Runs `fn` for `key`, or joins the call already in flight. `timeout` bounds how long
+        a joining caller waits (the leader always runs `fn` to completion), and `on_join` is
+        called once before a joining caller starts waiting.
+        """
+        with self._lock:
+            self._evict_expired()
+            if key in self._records:
+                return self._records[key][1]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if on_join is not None:
+                on_join()
+            if not call.done.wait(timeout):
+                raise SingleFlightTimeout(key)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if call.error is None and self.ttl > 0 and self.should_record(call.result):
+                    self._records[key] = (time.monotonic() + self.ttl, call.result)
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._records.items() if expires_at <= now]:
+            del self._records[key]